@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark: runs manager.run_scrapers against the replay server.
+Reports wall time, requests, bytes and peak RSS per run.
+
+Usage:
+  python benchmarks/bench_e2e.py --latency-ms 50 --error-rate 0.05 --runs 3
+  python benchmarks/bench_e2e.py --extract-text
+"""
+
+import argparse
+import tempfile
+import time
+
+import harness
+from replay_server import ReplayServer
+
+import content_store
+import manager
+import metrics
+import parse_pool
+
+
+def run_once(base_url: str) -> dict:
+    """One cold run (empty storage) of the full scraper pipeline."""
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        harness.redirect_storage(scratch_dir)
+        harness.point_scrapers_at(base_url)
+        metrics.reset()
+
+        start = time.perf_counter()
+        with harness.quiet():
+            manager.run_scrapers()
+        wall = time.perf_counter() - start
+
+        snapshot = metrics.snapshot()
+        fetched = sum(entry['value'] for entry in snapshot['counters'].get('scraper_articles_fetched_total', []))
+        return {'wall_seconds': round(wall, 3), 'articles_fetched': fetched}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline end-to-end scraper benchmark")
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--latency-ms', type=float, default=0, help="replay server delay per response")
+    parser.add_argument('--error-rate', type=float, default=0, help="fraction of replayed responses that fail")
+    parser.add_argument('--parse-workers', type=int, default=None, help="override SCRAPER_PARSE_WORKERS")
+    parser.add_argument('--extract-text', action='store_true', help="also extract and store full article text")
+    parser.add_argument('--json', help="write results to this path")
+    args = parser.parse_args()
+    content_store.EXTRACT_TEXT = args.extract_text
+
+    if args.parse_workers is not None:
+        parse_pool.PARSE_WORKERS = args.parse_workers
+        parse_pool.PARSE_MAX_PENDING = 2 * max(args.parse_workers, 1)
+
+    server = ReplayServer(latency_ms=args.latency_ms, error_rate=args.error_rate).start()
+    print(f"🎞️  Replay server at {server.base_url} "
+          f"(latency {args.latency_ms}ms, error rate {args.error_rate:.0%}, "
+          f"parse workers {parse_pool.PARSE_WORKERS})")
+
+    results = []
+    try:
+        for index in range(args.runs):
+            before = dict(server.stats)
+            result = run_once(server.base_url)
+            result['requests'] = server.stats['requests'] - before['requests']
+            result['bytes'] = server.stats['bytes'] - before['bytes']
+            result['errors_injected'] = server.stats['errors_injected'] - before['errors_injected']
+            result['peak_rss_mb'] = harness.peak_rss_mb()
+            results.append(result)
+            print(f"  run {index + 1}: {result['wall_seconds']:.3f}s, {result['articles_fetched']} articles, "
+                  f"{result['requests']} requests, {result['bytes'] / 1024:.1f} KiB, "
+                  f"{result['errors_injected']} injected errors, "
+                  f"peak RSS {result['peak_rss_mb']['self']} MiB (+{result['peak_rss_mb']['children']} MiB workers)")
+    finally:
+        server.stop()
+
+    walls = sorted(result['wall_seconds'] for result in results)
+    print(f"📊 median wall time: {walls[len(walls) // 2]:.3f}s over {len(walls)} runs")
+
+    if args.json:
+        harness.write_json(args.json, {'config': vars(args), 'runs': results})
+
+
+if __name__ == "__main__":
+    main()
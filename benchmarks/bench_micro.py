@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the hot functions on synthetic corpora:
+parsing, filter_last_24h, merge_articles, save_articles and ranking.
+
+Usage:
+  python benchmarks/bench_micro.py --sizes 1000,100000,1000000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+from datetime import datetime, timezone, timedelta
+
+import harness
+
+import manager
+import parsers
+import ranking
+from article import Article
+import storage_manager
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+SOURCES = ["Ben's Bites", "The AI Rundown", "Reddit"]
+
+
+def make_corpus(size: int, seed: int = 0) -> list:
+    """Synthetic articles spread over the last 48 hours."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    corpus = []
+    for i in range(size):
+        source = SOURCES[i % len(SOURCES)]
+        url = f"https://example.com/{source[:3].lower()}/{i}"
+        corpus.append(Article(
+            id=storage_manager.generate_article_id(url),
+            title=f"Synthetic article {i}",
+            source=source,
+            url=url,
+            summary="Synthetic summary text for benchmarking. " * 3,
+            published_at=(now - timedelta(minutes=rng.randrange(48 * 60))).isoformat(),
+            category='AI News' if source != 'Reddit' else 'r/artificial',
+            metadata={'author': f"author{i % 50}", 'upvotes': rng.randrange(5000)}
+        ))
+    return corpus
+
+
+def bench_parsing(repeat: int) -> dict:
+    """Per-page parse cost on the recorded fixtures (independent of corpus size)."""
+    with open(os.path.join(FIXTURES_DIR, 'bensbites', 'archive'), 'rb') as f:
+        archive = f.read()
+    with open(os.path.join(FIXTURES_DIR, 'bensbites', 'p', '_default'), 'rb') as f:
+        article = f.read()
+
+    return {
+        'parse_archive_links_ms': round(harness.best_of(
+            lambda: parsers.parse_archive_links(archive, 'https://bensbites.com'), repeat) * 1000, 3),
+        'parse_article_page_ms': round(harness.best_of(
+            lambda: parsers.parse_article_page(article, 'Ben Tossell', True), repeat) * 1000, 3)
+    }
+
+
+def bench_size(size: int, repeat: int, scratch_dir: str) -> dict:
+    """Time filter, merge and save at one corpus size."""
+    corpus = make_corpus(size)
+    # New batch overlaps half of the existing corpus
+    incoming = [article.to_dict() for article in corpus[size // 2:]] + make_corpus(size // 2, seed=1)
+    # ~2% of the corpus saved
+    saved_ids = frozenset(article.id for article in random.Random(2).sample(corpus, size // 50))
+
+    result = {'size': size}
+    result['filter_last_24h_s'] = round(harness.best_of(
+        lambda: manager.filter_last_24h(corpus, saved_ids), repeat), 4)
+    result['merge_articles_s'] = round(harness.best_of(
+        lambda: storage_manager.merge_articles(corpus, [Article.coerce(a) for a in incoming], saved_ids), repeat), 4)
+
+    # Ranking: full build, then a sync where 1% of the corpus was replaced
+    result['rank_build_s'] = round(harness.best_of(lambda: ranking.RankIndex().sync(corpus), repeat), 4)
+    index = ranking.RankIndex()
+    index.sync(corpus)
+    churned = corpus[size // 100:] + make_corpus(size // 100, seed=3)
+    result['rank_sync_1pct_s'] = round(harness.best_of(lambda: index.sync(churned), 1), 4)
+    index.top(ranking.ALL, 50)  # rebuild any feed the churn invalidated
+    result['rank_top_ms'] = round(harness.best_of(lambda: index.top(ranking.ALL, 50), repeat) * 1000, 3)
+
+    harness.redirect_storage(scratch_dir)
+
+    def cold_save():
+        if os.path.exists(storage_manager.STORAGE_PATH):
+            os.remove(storage_manager.STORAGE_PATH)
+        storage_manager.save_articles(corpus)
+
+    with harness.quiet():
+        result['save_articles_s'] = round(harness.best_of(cold_save, repeat), 4)
+        # Unchanged corpus: hash check only, no write
+        result['save_articles_noop_s'] = round(harness.best_of(
+            lambda: storage_manager.save_articles(corpus), repeat), 4)
+    result['file_mb'] = round(os.path.getsize(storage_manager.STORAGE_PATH) / 1024 / 1024, 1)
+    result['peak_rss_mb'] = harness.peak_rss_mb()['self']
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks on synthetic corpora")
+    parser.add_argument('--sizes', default='1000,100000,1000000', help="comma-separated corpus sizes")
+    parser.add_argument('--repeat', type=int, default=3, help="best-of repetitions")
+    parser.add_argument('--json', help="write results to this path")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    print("🔬 Parsing (fixtures)")
+    parsing = bench_parsing(max(args.repeat, 10))
+    for name, value in parsing.items():
+        print(f"   {name}: {value}")
+
+    results = []
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        for size in sizes:
+            print(f"🔬 Corpus of {size:,} articles")
+            result = bench_size(size, args.repeat, scratch_dir)
+            results.append(result)
+            for name, value in result.items():
+                if name != 'size':
+                    print(f"   {name}: {value}")
+
+    if args.json:
+        harness.write_json(args.json, {'parsing': parsing, 'sizes': results})
+
+
+if __name__ == "__main__":
+    main()
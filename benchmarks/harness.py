@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Harness: Shared helpers for the benchmark scripts.
+Redirects every on-disk path used by tools/ into a scratch directory and
+points the scrapers at the local replay server.
+"""
+
+import json
+import os
+import resource
+import sys
+import time
+from contextlib import contextmanager
+
+TOOLS_DIR = os.path.join(os.path.dirname(__file__), '..', 'tools')
+sys.path.insert(0, TOOLS_DIR)
+
+import content_store
+import manager
+import pipeline
+import run_log
+import saved_store
+import scrape_bensbites
+import scrape_reddit
+import scrape_rundown
+import storage_manager
+
+
+def redirect_storage(scratch_dir: str) -> None:
+    """Keep benchmark runs away from the real articles.json, saved sets, content store, checkpoint and logs."""
+    storage_manager.STORAGE_PATH = os.path.join(scratch_dir, 'articles.json')
+    saved_store.SAVED_DIR = os.path.join(scratch_dir, 'saved')
+    content_store.CONTENT_DIR = os.path.join(scratch_dir, 'content')
+    pipeline.CHECKPOINT_PATH = os.path.join(scratch_dir, 'scrape_checkpoint.json')
+    pipeline.STAGE_PATH = os.path.join(scratch_dir, 'scrape_stage.jsonl')
+    manager.RUN_REPORT_PATH = os.path.join(scratch_dir, 'run_report.json')
+    run_log.RUN_LOG_PATH = os.path.join(scratch_dir, 'runs.jsonl')
+
+
+def point_scrapers_at(base_url: str) -> None:
+    """Send all scraper traffic to the replay server and disable politeness delays."""
+    scrape_bensbites.BASE_URL = f"{base_url}/bensbites"
+    scrape_rundown.BASE_URL = f"{base_url}/rundown"
+    scrape_reddit.BASE_URL = f"{base_url}/reddit"
+    for module in (scrape_bensbites, scrape_rundown, scrape_reddit):
+        module.RATE_LIMIT_SECONDS = 0
+    for module in (scrape_bensbites, scrape_rundown):
+        module.RETRY_BACKOFF_SECONDS = 0
+
+
+def peak_rss_mb() -> dict:
+    """Peak resident set size of this process and of its (parse pool) children."""
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return {
+        'self': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+        'children': round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1)
+    }
+
+
+@contextmanager
+def quiet():
+    """Silence the scrapers' progress output while timing."""
+    stdout = sys.stdout
+    with open(os.devnull, 'w') as devnull:
+        sys.stdout = devnull
+        try:
+            yield
+        finally:
+            sys.stdout = stdout
+
+
+def best_of(func, repeat: int = 3) -> float:
+    """Best wall time of `repeat` calls, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def write_json(path: str, results) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"📈 Results written to {path}")
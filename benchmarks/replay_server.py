@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Replay Server: Local HTTP stand-in for the scraped sites.
+Serves recorded fixtures from benchmarks/fixtures with configurable latency
+and error injection, so scrapers can run end to end without the network.
+
+Fixture layout mirrors the URL path under a per-source prefix:
+  /bensbites/archive            -> fixtures/bensbites/archive
+  /bensbites/p/<slug>           -> fixtures/bensbites/p/<slug> or p/_default
+  /reddit/r/<sub>/top.json      -> fixtures/reddit/r/<sub>/top.json or r/_default/top.json
+
+Placeholders __NOW_ISO__ and __NOW_EPOCH__ are replaced at serve time so
+fixture articles always fall inside the 24h window.
+"""
+
+import argparse
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def resolve_fixture(fixtures_dir: str, path: str):
+    """Map a request path to a fixture file, falling back to _default segments."""
+    parts = [part for part in path.split('/') if part and part not in ('.', '..')]
+    if not parts:
+        return None
+
+    candidates = [parts]
+    for index in range(len(parts) - 1, -1, -1):
+        candidates.append(parts[:index] + ['_default'] + parts[index + 1:])
+
+    for candidate in candidates:
+        file_path = os.path.join(fixtures_dir, *candidate)
+        if os.path.isfile(file_path):
+            return file_path
+    return None
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """Serve fixtures with the latency and error rate configured on the server"""
+
+    def do_GET(self):
+        server = self.server
+        with server.stats_lock:
+            server.stats['requests'] += 1
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        if server.error_rate and server.rng.random() < server.error_rate:
+            with server.stats_lock:
+                server.stats['errors_injected'] += 1
+            self.send_error(503, 'Injected error')
+            return
+
+        file_path = resolve_fixture(server.fixtures_dir, urlparse(self.path).path)
+        if file_path is None:
+            self.send_error(404, 'No fixture')
+            return
+
+        with open(file_path, 'rb') as f:
+            body = f.read()
+        now = datetime.now(timezone.utc)
+        body = body.replace(b'__NOW_ISO__', now.isoformat().encode())
+        body = body.replace(b'__NOW_EPOCH__', str(int(now.timestamp())).encode())
+
+        content_type = 'application/json' if body.lstrip().startswith(b'{') else 'text/html; charset=utf-8'
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+        with server.stats_lock:
+            server.stats['bytes'] += len(body)
+
+    def log_message(self, format, *args):
+        """Keep benchmark output quiet"""
+        pass
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """Threaded replay server that counts requests, bytes and injected errors"""
+
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, latency_ms: float = 0, error_rate: float = 0,
+                 fixtures_dir: str = FIXTURES_DIR, seed: int = 0):
+        super().__init__(('127.0.0.1', port), ReplayHandler)
+        self.latency = latency_ms / 1000.0
+        self.error_rate = error_rate
+        self.fixtures_dir = fixtures_dir
+        self.rng = random.Random(seed)
+        self.stats_lock = threading.Lock()
+        self.stats = {'requests': 0, 'bytes': 0, 'errors_injected': 0}
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self) -> 'ReplayServer':
+        """Serve on a background thread."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded scraper fixtures locally")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0, help="delay added to every response")
+    parser.add_argument('--error-rate', type=float, default=0, help="fraction of requests answered with 503")
+    parser.add_argument('--fixtures', default=FIXTURES_DIR)
+    args = parser.parse_args()
+
+    server = ReplayServer(args.port, args.latency_ms, args.error_rate, args.fixtures)
+    print(f"🎞️  Replaying {args.fixtures} at {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Replay server stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,26 @@
 // Dashboard JavaScript - Handles article rendering, filtering, and save functionality
 
 let allArticles = [];
+let articlesById = new Map();
+let counts = { all: 0, saved: 0 }; // articles per filter: all, saved and each source
+let filterViews = new Map(); // filter -> articles in display order
 let currentFilter = 'all';
+let currentSort = 'date'; // 'date' (all articles, newest first) or 'rank' (server top-K)
 const AUTO_REFRESH_INTERVAL = 60000; // 60 seconds
 
+// Virtualized grid: only rows near the viewport are in the DOM
+const ROW_HEIGHT_ESTIMATE = 320; // px, until a rendered row has been measured
+const OVERSCAN_ROWS = 3; // rows mounted above and below the viewport
+const mountedCards = new Map(); // article ID -> card element in the grid
+const cardKeys = new WeakMap(); // card element -> cardKey() it was built from
+let rowHeight = ROW_HEIGHT_ESTIMATE;
+let renderScheduled = false;
+
 // Initialize dashboard
 document.addEventListener('DOMContentLoaded', () => {
+    setupGrid();
     setupFilters();
+    setupSort();
     loadArticles();
 
     // Auto-refresh every 60 seconds
@@ -15,9 +29,24 @@ document.addEventListener('DOMContentLoaded', () => {
     }, AUTO_REFRESH_INTERVAL);
 });
 
+// One delegated click handler for every save button, and re-windowing on scroll/resize
+function setupGrid() {
+    const grid = document.getElementById('articles-grid');
+
+    grid.addEventListener('click', (e) => {
+        const saveButton = e.target.closest('.save-btn');
+        if (!saveButton) return;
+        e.preventDefault();
+        toggleSave(saveButton.dataset.id);
+    });
+
+    window.addEventListener('scroll', scheduleRender, { passive: true });
+    window.addEventListener('resize', scheduleRender);
+}
+
 // Setup filter buttons
 function setupFilters() {
-    const filterButtons = document.querySelectorAll('.filter-btn');
+    const filterButtons = document.querySelectorAll('.filter-btn[data-filter]');
 
     filterButtons.forEach(btn => {
         btn.addEventListener('click', () => {
@@ -28,12 +57,38 @@ function setupFilters() {
             // Update current filter
             currentFilter = btn.dataset.filter;
 
-            // Re-render articles
-            renderArticles();
+            // Ranked feeds are per filter on the server; date order is filtered locally
+            if (currentSort === 'rank') {
+                loadArticles();
+            } else {
+                renderArticles();
+            }
         });
     });
 }
 
+// Setup the "Top" (ranked) toggle
+function setupSort() {
+    const sortButton = document.querySelector('.filter-btn[data-sort]');
+    if (!sortButton) {
+        return; // static preview (index.html) has no ranking API
+    }
+
+    sortButton.addEventListener('click', () => {
+        currentSort = currentSort === 'rank' ? 'date' : 'rank';
+        sortButton.classList.toggle('active', currentSort === 'rank');
+        loadArticles();
+    });
+}
+
+// API URL for the current sort mode
+function articlesUrl() {
+    if (currentSort === 'rank') {
+        return `/api/articles?sort=rank&filter=${encodeURIComponent(currentFilter)}`;
+    }
+    return '/api/articles';
+}
+
 // Load articles from API
 async function loadArticles(silent = false) {
     if (!silent) {
@@ -41,14 +96,14 @@ async function loadArticles(silent = false) {
     }
 
     try {
-        const response = await fetch('/api/articles');
+        const response = await fetch(articlesUrl());
 
         if (!response.ok) {
             throw new Error(`HTTP ${response.status}: ${response.statusText}`);
         }
 
         const data = await response.json();
-        allArticles = data.articles || [];
+        setArticles(data.articles || []);
 
         // Update stats
         updateStats(data.last_updated);
@@ -66,52 +121,242 @@ async function loadArticles(silent = false) {
     }
 }
 
+// Replace the article list (one pass: sort keys, ID index and per-filter counts)
+function setArticles(articles) {
+    articles.forEach(article => {
+        article.publishedTs = Date.parse(article.published_at) || 0;
+    });
+
+    // Sort by published date (newest first); ranked results keep the server order
+    if (currentSort === 'date') {
+        articles.sort((a, b) => b.publishedTs - a.publishedTs);
+    }
+
+    allArticles = articles;
+    articlesById = new Map(articles.map(article => [article.id, article]));
+    filterViews = new Map();
+
+    // A ranked feed is only the top-K: keep the counts of the full list
+    if (currentSort === 'date') {
+        counts = countArticles(articles);
+    }
+}
+
+// Number of articles per filter: all, saved and each source
+function countArticles(articles) {
+    const result = { all: articles.length, saved: 0 };
+    articles.forEach(article => {
+        result[article.source] = (result[article.source] || 0) + 1;
+        if (article.saved) {
+            result.saved += 1;
+        }
+    });
+    return result;
+}
+
+// Articles of a filter, in display order (built once per load, then kept up to date)
+function getView(filter) {
+    let view = filterViews.get(filter);
+    if (!view) {
+        view = filterArticles(allArticles, filter);
+        filterViews.set(filter, view);
+    }
+    return view;
+}
+
+// Filter articles based on filter type
+function filterArticles(articles, filter) {
+    if (filter === 'all') {
+        return articles;
+    }
+
+    if (filter === 'saved') {
+        return articles.filter(a => a.saved);
+    }
+
+    // Filter by source
+    return articles.filter(a => a.source === filter);
+}
+
+// Apply one save toggle to the counts and the cached saved view
+function applySaveChange(article) {
+    counts.saved += article.saved ? 1 : -1;
+
+    const view = filterViews.get('saved');
+    if (!view) {
+        return;
+    }
+    if (!article.saved) {
+        const index = view.indexOf(article);
+        if (index !== -1) {
+            view.splice(index, 1);
+        }
+    } else if (currentSort === 'date') {
+        // Binary search for the article's place in newest-first order
+        let low = 0;
+        let high = view.length;
+        while (low < high) {
+            const mid = (low + high) >> 1;
+            if (view[mid].publishedTs >= article.publishedTs) {
+                low = mid + 1;
+            } else {
+                high = mid;
+            }
+        }
+        view.splice(low, 0, article);
+    } else {
+        filterViews.delete('saved'); // ranked order: rebuilt from the (small) feed
+    }
+}
+
 // Render articles based on current filter
 function renderArticles() {
-    const grid = document.getElementById('articles-grid');
     const loading = document.getElementById('loading');
     const emptyState = document.getElementById('empty-state');
     const errorState = document.getElementById('error-state');
 
     // Hide all states
     loading.style.display = 'none';
-    emptyState.style.display = 'none';
     errorState.style.display = 'none';
 
-    // Filter articles
-    let filtered = filterArticles(allArticles, currentFilter);
+    // Show empty state if no articles
+    const empty = getView(currentFilter).length === 0;
+    emptyState.style.display = empty ? 'block' : 'none';
+    if (empty) {
+        clearGrid();
+        return;
+    }
 
-    // Sort by published date (newest first)
-    filtered.sort((a, b) => {
-        return new Date(b.published_at) - new Date(a.published_at);
-    });
+    renderWindow();
+}
 
-    // Show empty state if no articles
-    if (filtered.length === 0) {
-        grid.innerHTML = '';
-        emptyState.style.display = 'block';
+// Render again on the next animation frame (coalesces scroll and resize events)
+function scheduleRender() {
+    if (renderScheduled) {
         return;
     }
+    renderScheduled = true;
+    requestAnimationFrame(() => {
+        renderScheduled = false;
+        if (allArticles.length) {
+            renderWindow();
+        }
+    });
+}
 
-    // Render article cards
-    grid.innerHTML = filtered.map(article => createArticleCard(article)).join('');
+// Mount only the rows in (or near) the viewport; padding stands in for the rest
+function renderWindow() {
+    const grid = document.getElementById('articles-grid');
+    const view = getView(currentFilter);
+    const columns = gridColumns(grid);
+    const totalRows = Math.ceil(view.length / columns);
 
-    // Attach save button listeners
-    attachSaveListeners();
+    const gridTop = grid.getBoundingClientRect().top + window.scrollY;
+    const firstVisible = Math.floor(Math.max(0, window.scrollY - gridTop) / rowHeight);
+    const visibleRows = Math.ceil(window.innerHeight / rowHeight) + 1;
+    const firstRow = Math.min(Math.max(0, firstVisible - OVERSCAN_ROWS), Math.max(0, totalRows - 1));
+    const lastRow = Math.min(totalRows, firstVisible + visibleRows + OVERSCAN_ROWS);
+
+    patchGrid(grid, view.slice(firstRow * columns, lastRow * columns));
+    measureRowHeight(grid, lastRow - firstRow);
+
+    grid.style.paddingTop = `${firstRow * rowHeight}px`;
+    grid.style.paddingBottom = `${(totalRows - lastRow) * rowHeight}px`;
 }
 
-// Filter articles based on filter type
-function filterArticles(articles, filter) {
-    if (filter === 'all') {
-        return articles;
+// Number of columns the CSS grid currently lays out
+function gridColumns(grid) {
+    const tracks = getComputedStyle(grid).gridTemplateColumns.split(' ').filter(Boolean);
+    return Math.max(tracks.length, 1);
+}
+
+// Average height of a mounted row (including the gap), used to size the padding
+function measureRowHeight(grid, rows) {
+    const first = grid.firstElementChild;
+    const last = grid.lastElementChild;
+    if (!first || rows <= 0) {
+        return;
+    }
+    const gap = parseFloat(getComputedStyle(grid).rowGap) || 0;
+    const measured = (last.offsetTop + last.offsetHeight - first.offsetTop + gap) / rows;
+    if (measured > 0) {
+        rowHeight = measured;
     }
+}
 
-    if (filter === 'saved') {
-        return articles.filter(a => a.saved);
+// Keyed diff: reuse mounted cards by article ID, create/remove only what changed
+function patchGrid(grid, articles) {
+    const wanted = new Set(articles.map(article => article.id));
+    mountedCards.forEach((card, id) => {
+        if (!wanted.has(id)) {
+            card.remove();
+            mountedCards.delete(id);
+        }
+    });
+
+    let next = grid.firstElementChild;
+    articles.forEach(article => {
+        let card = mountedCards.get(article.id);
+        if (card && cardKeys.get(card) !== cardKey(article)) {
+            // Content changed (not just saved state or age): replace the card
+            const fresh = createCardElement(article);
+            if (next === card) {
+                next = fresh;
+            }
+            card.replaceWith(fresh);
+            card = fresh;
+        } else if (card) {
+            patchCard(card, article);
+        } else {
+            card = createCardElement(article);
+        }
+        mountedCards.set(article.id, card);
+
+        if (card === next) {
+            next = next.nextElementSibling;
+        } else {
+            grid.insertBefore(card, next);
+        }
+    });
+}
+
+// Remove every mounted card
+function clearGrid() {
+    const grid = document.getElementById('articles-grid');
+    mountedCards.clear();
+    grid.innerHTML = '';
+    grid.style.paddingTop = '';
+    grid.style.paddingBottom = '';
+}
+
+// Fields that require rebuilding a card when they change
+function cardKey(article) {
+    return [article.source, article.title, article.summary, article.url, article.published_at].join('\u0000');
+}
+
+// Build a card element from its HTML
+function createCardElement(article) {
+    const template = document.createElement('template');
+    template.innerHTML = createArticleCard(article).trim();
+    const card = template.content.firstElementChild;
+    cardKeys.set(card, cardKey(article));
+    return card;
+}
+
+// Update the parts of a mounted card that change in place
+function patchCard(card, article) {
+    const saveButton = card.querySelector('.save-btn');
+    const saved = Boolean(article.saved);
+    if (saveButton.classList.contains('saved') !== saved) {
+        saveButton.classList.toggle('saved', saved);
+        saveButton.textContent = saved ? '❤️' : '🤍';
     }
 
-    // Filter by source
-    return articles.filter(a => a.source === filter);
+    const meta = card.querySelector('.article-meta');
+    const timeAgo = getTimeAgo(article.published_at);
+    if (meta.textContent !== timeAgo) {
+        meta.textContent = timeAgo;
+    }
 }
 
 // Create article card HTML
@@ -145,23 +390,10 @@ function createArticleCard(article) {
     `;
 }
 
-// Attach save button listeners
-function attachSaveListeners() {
-    const saveButtons = document.querySelectorAll('.save-btn');
-
-    saveButtons.forEach(btn => {
-        btn.addEventListener('click', async (e) => {
-            e.preventDefault();
-            const articleId = btn.dataset.id;
-            await toggleSave(articleId);
-        });
-    });
-}
-
 // Toggle save status
 async function toggleSave(articleId) {
     try {
-        const article = allArticles.find(a => a.id === articleId);
+        const article = articlesById.get(articleId);
         if (!article) return;
 
         const newSavedStatus = !article.saved;
@@ -181,13 +413,14 @@ async function toggleSave(articleId) {
             throw new Error('Failed to update save status');
         }
 
-        // Update local state
+        // Update local state, counts and the saved view
         article.saved = newSavedStatus;
+        applySaveChange(article);
 
         // Update stats
         updateStats();
 
-        // Re-render to update UI
+        // Re-render: only this card (or the saved view's window) changes
         renderArticles();
 
         showNotification(newSavedStatus ? 'Article saved!' : 'Article unsaved');
@@ -200,21 +433,18 @@ async function toggleSave(articleId) {
 
 // Update stats bar
 function updateStats(lastUpdated = null) {
-    const totalCount = allArticles.length;
-    const savedCount = allArticles.filter(a => a.saved).length;
-
-    document.getElementById('total-count').textContent = totalCount;
-    document.getElementById('saved-count').textContent = savedCount;
-
     if (lastUpdated) {
         document.getElementById('last-updated').textContent = getTimeAgo(lastUpdated);
     }
+
+    document.getElementById('total-count').textContent = counts.all;
+    document.getElementById('saved-count').textContent = counts.saved;
 }
 
 // Show loading state
 function showLoading() {
     document.getElementById('loading').style.display = 'block';
-    document.getElementById('articles-grid').innerHTML = '';
+    clearGrid();
     document.getElementById('empty-state').style.display = 'none';
     document.getElementById('error-state').style.display = 'none';
 }
@@ -224,7 +454,7 @@ function showError(message) {
     document.getElementById('error-state').style.display = 'block';
     document.getElementById('error-message').textContent = message;
     document.getElementById('loading').style.display = 'none';
-    document.getElementById('articles-grid').innerHTML = '';
+    clearGrid();
     document.getElementById('empty-state').style.display = 'none';
 }
 
@@ -1,46 +1,470 @@
 #!/usr/bin/env python3
 """
 Simple HTTP server to serve the dashboard and handle API requests
+
+Files (static assets and the raw /api/articles payload) are streamed with
+sendfile, using a precompressed .gz sibling when the client accepts gzip.
+Saved state is per user (?user=, default "default") and joined onto the
+cached corpus encoding at read time; toggles never rewrite articles.json.
+dashboard.js/css are referenced with a content hash (?v=...) so they can be
+cached as immutable; Range requests are honoured for uncompressed files.
 """
 
 import http.server
 import socketserver
+import gzip
+import hashlib
 import json
 import os
+import re
 import sys
+import time
+from email.utils import formatdate
 from urllib.parse import urlparse, parse_qs
 
 # Add tools directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'tools'))
+import storage_manager
 from storage_manager import load_articles, update_saved_status
+from article import to_dicts
+import saved_store
+import content_store
+from ranking import RankIndex, ALL, TOP_K, score_at
+import metrics
 
 PORT = 8000
 
+# Loaded storage, reused for save toggles while the storage version and
+# content hash are unchanged
+_articles_cache = {'data': None}
+
+# /api/articles bodies: per-article JSON fragments for the cached corpus, and
+# the last joined body (corpus + one user's saved set)
+_payload_cache = {'corpus_key': None, 'fragments': None, 'key': None, 'body': None, 'gzip': None, 'etag': None}
+
+# (mtime_ns, size, inode) of the storage file last checked, and whether it can be sent as is
+_verified_storage = {'key': None, 'raw_ok': False}
+
+# Top-K ranked feeds, synced incrementally whenever the corpus changes
+_rank_state = {'corpus_key': None, 'index': RankIndex()}
+
+# Assets referenced from dashboard.html with a content hash
+HASHED_ASSETS = ('dashboard.css', 'dashboard.js')
+
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE = 'no-cache'
+
+# Files smaller than this are not worth compressing
+GZIP_MIN_SIZE = 1024
+
+# Top-level static files that get a .gz sibling; nothing else in the served tree is written to
+GZIP_STATIC = HASHED_ASSETS + ('articles.json',)
+
+# (mtime_ns, size) -> short content hash, per asset path
+_asset_versions = {}
+
+# source path -> (st_ino, st_size, st_mtime_ns) of the source its .gz sibling was built from
+_gzip_sources = {}
+
+# Rendered dashboard.html, keyed on the asset versions it references
+_html_cache = {'key': None, 'body': None, 'gzip': None}
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def get_cached_articles() -> dict:
+    """Return loaded storage, re-reading only when it changed on disk"""
+    data = _articles_cache['data']
+    if data is not None and storage_manager.is_current(data, storage_manager.read_header()):
+        metrics.inc('dashboard_articles_cache_total', result='hit')
+        return data
+    
+    metrics.inc('dashboard_articles_cache_total', result='miss')
+    _articles_cache['data'] = load_articles()
+    return _articles_cache['data']
+
+
+def storage_verified() -> bool:
+    """
+    Whether articles.json on disk can be sent as is: it passes its checksum
+    and carries no legacy `saved` flags (not yet migrated). Checked once per
+    change of the file, so a corrupt file is never streamed to clients.
+    """
+    stat = os.stat(storage_manager.STORAGE_PATH)
+    key = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    if _verified_storage['key'] != key:
+        data = storage_manager.read_intact()
+        raw_ok = data is not None and all(article.saved is None for article in data['articles'])
+        _verified_storage.update(key=key, raw_ok=raw_ok)
+    return _verified_storage['raw_ok']
+
+
+def articles_payload(user: str):
+    """
+    /api/articles body for a user: the corpus joined with their saved set.
+    Articles are encoded once per corpus version; a join only splices the
+    `saved` flag onto each fragment. Returns (body, gzipped body, etag).
+    """
+    data = get_cached_articles()
+    saved = saved_store.load_saved(user)
+    corpus_key = (data.get('version', 0), data.get('content_hash'))
+    key = corpus_key + (user, saved['version'])
+    if _payload_cache['key'] == key:
+        return _payload_cache['body'], _payload_cache['gzip'], _payload_cache['etag']
+    
+    ids = saved['ids']
+    joined = b', '.join(
+        fragment + (b', "saved": true}' if article_id in ids else b', "saved": false}')
+        for article_id, fragment in corpus_fragments(data).items()
+    )
+    body = joined_body(joined, data, saved, user=user)
+    etag = '"%s-%s-%s-%s"' % (corpus_key[0], (corpus_key[1] or '')[:12], user, saved['version'])
+    _payload_cache.update(key=key, body=body, gzip=gzip.compress(body, compresslevel=6), etag=etag)
+    return body, _payload_cache['gzip'], etag
+
+
+def corpus_fragments(data: dict) -> dict:
+    """id -> article JSON without its closing brace (so fields can be appended), per corpus version"""
+    corpus_key = (data.get('version', 0), data.get('content_hash'))
+    if _payload_cache['corpus_key'] != corpus_key:
+        fragments = {}
+        for article in data['articles']:
+            record = article.to_dict()
+            record.pop('saved', None)  # legacy flag of a not yet migrated file; the join adds its own
+            fragments[article.id] = json.dumps(record, ensure_ascii=False, sort_keys=True).encode('utf-8')[:-1]
+        _payload_cache['fragments'] = fragments
+        _payload_cache['corpus_key'] = corpus_key
+    return _payload_cache['fragments']
+
+
+def joined_body(joined: bytes, data: dict, saved: dict, **fields) -> bytes:
+    """Wrap joined article fragments in the storage header fields"""
+    header = dict(fields, content_hash=data.get('content_hash'), last_updated=data.get('last_updated'),
+                  saved_version=saved['version'], version=data.get('version', 0))
+    return b'{"articles": [' + joined + b'], ' + json.dumps(header, sort_keys=True).encode('utf-8')[1:]
+
+
+def get_rank_index(data: dict) -> RankIndex:
+    """Ranking index for the loaded corpus; only the articles that changed are re-ranked"""
+    corpus_key = (data.get('version', 0), data.get('content_hash'))
+    if _rank_state['corpus_key'] != corpus_key:
+        with metrics.timed('dashboard_rank_sync_duration_seconds'):
+            changes = _rank_state['index'].sync(data['articles'])
+        for change, count in changes.items():
+            metrics.inc('dashboard_rank_synced_articles_total', count, change=change)
+        _rank_state['corpus_key'] = corpus_key
+    return _rank_state['index']
+
+
+def ranked_payload(user: str, feed: str = ALL, limit: int = TOP_K) -> bytes:
+    """
+    /api/articles?sort=rank body: the top `limit` articles of a feed ('all',
+    'saved' or a source name), best first, with their current score.
+    """
+    data = get_cached_articles()
+    saved = saved_store.load_saved(user)
+    index = get_rank_index(data)
+    if feed == 'saved':
+        entries = index.top_of(saved['ids'], limit)
+    else:
+        entries = index.top(feed, limit)
+    
+    fragments = corpus_fragments(data)
+    ids = saved['ids']
+    now = time.time()
+    joined = b', '.join(
+        fragments[article.id]
+        + b', "saved": %s, "score": %.6g}' % (b'true' if article.id in ids else b'false', score_at(key, now))
+        for key, article in entries
+    )
+    return joined_body(joined, data, saved, feed=feed, sort='rank', user=user)
+
+
+def asset_version(path: str) -> str:
+    """Short content hash of a file, recomputed only when it changes"""
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _asset_versions.get(path)
+    if cached and cached[0] == key:
+        return cached[1]
+    
+    with open(path, 'rb') as f:
+        version = hashlib.sha256(f.read()).hexdigest()[:12]
+    _asset_versions[path] = (key, version)
+    return version
+
+
+def ensure_gzip(path: str):
+    """
+    Return the path of an up-to-date .gz sibling of path, creating it if needed.
+    A sibling is only reused if it was built from this exact file (inode, size,
+    mtime): a snapshot restore puts back an older file with an older mtime.
+    """
+    gz_path = path + '.gz'
+    stat = os.stat(path)
+    if stat.st_size < GZIP_MIN_SIZE:
+        return None
+    
+    source = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    if _gzip_sources.get(path) == source and os.path.exists(gz_path):
+        return gz_path
+    
+    temp_path = f"{gz_path}.{os.getpid()}.tmp"
+    with open(path, 'rb') as src, gzip.open(temp_path, 'wb', compresslevel=9) as dst:
+        stat = os.fstat(src.fileno())  # the file actually compressed, if path was just replaced
+        dst.write(src.read())
+    os.replace(temp_path, gz_path)
+    _gzip_sources[path] = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    return gz_path
+
+
+def accepts_gzip(header: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip (an explicit gzip entry overrides *)"""
+    allowed = {}
+    for part in (header or '').split(','):
+        token, _, params = part.strip().partition(';')
+        allowed[token.strip().lower()] = params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+    return allowed.get('gzip', allowed.get('*', False))
+
+
+def parse_range(header: str, size: int):
+    """
+    Parse a single-range `bytes=` header.
+    Returns (start, end) inclusive, None to ignore the header, or 'invalid'.
+    """
+    match = _RANGE_RE.match((header or '').strip())
+    if not match or not (match.group(1) or match.group(2)):
+        return None
+    
+    if match.group(1):
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else size - 1
+    else:
+        start = max(size - int(match.group(2)), 0)
+        end = size - 1
+    
+    if start >= size or start > end:
+        return 'invalid'
+    return start, min(end, size - 1)
+
+
+def render_dashboard_html(root: str):
+    """dashboard.html with content-hashed asset references, plus its gzip"""
+    html_path = os.path.join(root, 'dashboard.html')
+    versions = tuple(asset_version(os.path.join(root, name)) for name in HASHED_ASSETS)
+    key = (os.stat(html_path).st_mtime_ns, versions)
+    if _html_cache['key'] != key:
+        with open(html_path, 'r', encoding='utf-8') as f:
+            html = f.read()
+        for name, version in zip(HASHED_ASSETS, versions):
+            html = html.replace(f'"{name}"', f'"{name}?v={version}"')
+        body = html.encode('utf-8')
+        _html_cache.update(key=key, body=body, gzip=gzip.compress(body, compresslevel=9))
+    return _html_cache['body'], _html_cache['gzip']
+
+
+def route_label(path: str) -> str:
+    """Collapse request paths into a small set of metric labels"""
+    if path.startswith('/api/articles/') and path.endswith('/save'):
+        return '/api/articles/:id/save'
+    if path.startswith('/api/articles/') and path.endswith('/content'):
+        return '/api/articles/:id/content'
+    if path in ('/api/articles', '/metrics'):
+        return path
+    return 'static'
+
 
 class DashboardHandler(http.server.SimpleHTTPRequestHandler):
     """Custom handler for dashboard API endpoints"""
     
+    def send_response(self, code, message=None):
+        """Remember the status code for request metrics"""
+        self._status = code
+        super().send_response(code, message)
+    
+    def handle_one_request(self):
+        """Time every request into the server latency histogram"""
+        self._status = None
+        start = time.perf_counter()
+        super().handle_one_request()
+        if self._status is not None:
+            route = route_label(urlparse(getattr(self, 'path', '')).path)
+            method = self.command or 'UNKNOWN'
+            metrics.observe('dashboard_http_request_duration_seconds', time.perf_counter() - start,
+                            route=route, method=method)
+            metrics.inc('dashboard_http_requests_total', route=route, method=method, status=self._status)
+    
+    def send_bytes(self, body: bytes, content_type: str, cache_control: str = REVALIDATE_CACHE,
+                   gzipped: bytes = None, extra_headers: dict = None, etag: str = None):
+        """Send an in-memory body, using its precompressed form when accepted"""
+        etag = etag or '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        
+        use_gzip = gzipped is not None and accepts_gzip(self.headers.get('Accept-Encoding'))
+        payload = gzipped if use_gzip else body
+        self.send_response(200)
+        self.send_header('Content-type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('Cache-Control', cache_control)
+        self.send_header('ETag', etag)
+        self.send_header('Vary', 'Accept-Encoding')
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def send_file(self, path: str, content_type: str, cache_control: str = REVALIDATE_CACHE,
+                  extra_headers: dict = None, compress: bool = False):
+        """
+        Stream a file with sendfile.
+        With compress, picks the .gz sibling when gzip is accepted and no Range
+        was asked for; answers If-None-Match with 304 and a single byte Range with 206.
+        """
+        range_header = self.headers.get('Range')
+        gz_path = None
+        if compress and not range_header and accepts_gzip(self.headers.get('Accept-Encoding')):
+            gz_path = ensure_gzip(path)
+        
+        with open(gz_path or path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            etag = '"%x-%x%s"' % (stat.st_mtime_ns, stat.st_size, '-gz' if gz_path else '')
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Cache-Control', cache_control)
+                self.end_headers()
+                return
+            
+            start, end = 0, stat.st_size - 1
+            byte_range = parse_range(range_header, stat.st_size) if range_header else None
+            if byte_range == 'invalid':
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{stat.st_size}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            
+            if byte_range:
+                start, end = byte_range
+                self.send_response(206)
+                self.send_header('Content-Range', f'bytes {start}-{end}/{stat.st_size}')
+            else:
+                self.send_response(200)
+            
+            length = end - start + 1 if stat.st_size else 0
+            self.send_header('Content-type', content_type)
+            self.send_header('Content-Length', str(length))
+            self.send_header('Cache-Control', cache_control)
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', formatdate(stat.st_mtime, usegmt=True))
+            self.send_header('Accept-Ranges', 'bytes')
+            self.send_header('Vary', 'Accept-Encoding')
+            if gz_path:
+                self.send_header('Content-Encoding', 'gzip')
+            for name, value in (extra_headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            
+            if length:
+                # socket.sendfile uses os.sendfile where available (zero-copy)
+                self.connection.sendfile(f, offset=start, count=length)
+                metrics.inc('dashboard_bytes_sent_total', length, encoding='gzip' if gz_path else 'identity')
+    
     def do_GET(self):
         """Handle GET requests"""
         parsed_path = urlparse(self.path)
         
-        # Serve dashboard HTML
+        # Metrics in Prometheus text format
+        if parsed_path.path == '/metrics':
+            body = metrics.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header('Content-type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        
+        # Serve dashboard HTML (asset references carry content hashes)
         if parsed_path.path == '/' or parsed_path.path == '/index.html':
-            self.path = '/dashboard.html'
-            return super().do_GET()
+            body, gzipped = render_dashboard_html(self.directory)
+            self.send_bytes(body, 'text/html; charset=utf-8', gzipped=gzipped)
+            return
         
-        # API: Get articles
+        # API: Get articles, joined with the user's saved set
         if parsed_path.path == '/api/articles':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
+            cors = {'Access-Control-Allow-Origin': '*'}
+            query = parse_qs(parsed_path.query)
+            user = query.get('user', [saved_store.DEFAULT_USER])[0]
+            try:
+                saved_ids = saved_store.saved_ids(user)
+                limit = int(query.get('limit', [TOP_K])[0])
+                if limit < 1:
+                    raise ValueError(f"Invalid limit: {limit}")
+            except ValueError as e:
+                self.send_response(400)
+                self.send_header('Content-type', 'application/json')
+                self.end_headers()
+                self.wfile.write(json.dumps({'error': str(e)}).encode())
+                return
+            
+            if query.get('sort', [None])[0] == 'rank':
+                feed = query.get('filter', [ALL])[0]
+                self.send_bytes(ranked_payload(user, feed, limit), 'application/json', extra_headers=cors)
+            elif not os.path.exists(storage_manager.STORAGE_PATH):
+                data = dict(load_articles())
+                data['articles'] = to_dicts(data['articles'])
+                self.send_bytes(json.dumps(data).encode(), 'application/json', extra_headers=cors)
+            elif not saved_ids and storage_verified():
+                # Nothing to join, the file passed its checksum and has no legacy flags: stream it as-is
+                self.send_file(storage_manager.STORAGE_PATH, 'application/json', extra_headers=cors, compress=True)
+            else:
+                # Joined (or recovered, or legacy flags dropped) payload from loaded storage
+                body, gzipped, etag = articles_payload(user)
+                self.send_bytes(body, 'application/json', gzipped=gzipped, extra_headers=cors, etag=etag)
+            return
+        
+        # API: Full text of one article, loaded on demand from the content store
+        if parsed_path.path.startswith('/api/articles/') and parsed_path.path.endswith('/content'):
+            article_id = parsed_path.path.split('/')[3]
+            digest = content_store.content_digest(article_id)
+            blob = None
+            if digest is not None:
+                try:
+                    blob = content_store.read_blob(digest)
+                except OSError as e:
+                    # Indexed but missing (interrupted write, or content/ cleaned up by hand)
+                    print(f"⚠️  Content blob of {article_id} unreadable: {e}")
+            if blob is None:
+                self.send_response(404)
+                self.send_header('Content-type', 'application/json')
+                self.end_headers()
+                self.wfile.write(json.dumps({'error': 'No content for this article'}).encode())
+                return
             
-            data = load_articles()
-            self.wfile.write(json.dumps(data).encode())
+            # Blobs are stored gzipped: decompress only for clients that do not accept gzip
+            body = blob if accepts_gzip(self.headers.get('Accept-Encoding')) else gzip.decompress(blob)
+            self.send_bytes(body, 'text/plain; charset=utf-8', gzipped=blob,
+                            extra_headers={'Access-Control-Allow-Origin': '*'}, etag=f'"{digest[:16]}"')
             return
         
         # Serve static files
+        file_path = self.translate_path(self.path)
+        if os.path.isfile(file_path):
+            name = os.path.basename(file_path)
+            version = parse_qs(parsed_path.query).get('v', [None])[0]
+            immutable = name in HASHED_ASSETS and version == asset_version(file_path)
+            top_level = os.path.dirname(os.path.abspath(file_path)) == os.path.abspath(self.directory)
+            self.send_file(file_path, self.guess_type(file_path),
+                           IMMUTABLE_CACHE if immutable else REVALIDATE_CACHE,
+                           compress=top_level and name in GZIP_STATIC)
+            return
+        
         return super().do_GET()
     
     def do_POST(self):
@@ -59,9 +483,13 @@ class DashboardHandler(http.server.SimpleHTTPRequestHandler):
             data = json.loads(body.decode())
             
             saved = data.get('saved', False)
+            user = parse_qs(parsed_path.query).get('user', [saved_store.DEFAULT_USER])[0]
             
-            # Update saved status
-            success = update_saved_status(article_id, saved)
+            # Update the user's saved set (the article corpus is not rewritten)
+            try:
+                success = update_saved_status(article_id, saved, cached=get_cached_articles(), user=user) is not None
+            except ValueError:
+                success = False
             
             if success:
                 self.send_response(200)
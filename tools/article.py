@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Article: Compact in-memory representation of the Article Schema (gemini.md).
+Uses __slots__ instead of a per-article dict, interns low-cardinality strings
+(source, category, author, subreddit) and keeps an integer epoch timestamp
+next to the original published_at string.
+
+Round-trips losslessly: Article.from_dict(d).to_dict() == d. Optional fields
+that were absent stay absent (their slot is simply never assigned), and
+unknown keys are carried in `extra` / `metadata_extra`.
+
+`saved` is per-user state (saved_store.py), not part of the corpus record.
+"""
+
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+REQUIRED_FIELDS = ('id', 'title', 'source', 'url', 'published_at')
+
+# Optional top-level fields stored in their own slot
+OPTIONAL_FIELDS = ('summary', 'category')
+
+# Known metadata keys stored in their own slot
+METADATA_FIELDS = ('author', 'upvotes', 'subreddit', 'newsletter_issue')
+
+# Low-cardinality string fields shared by many articles
+INTERNED_FIELDS = frozenset(('source', 'category', 'author', 'subreddit', 'newsletter_issue'))
+
+_MISSING = object()
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def parse_timestamp(published_at) -> Optional[int]:
+    """Epoch seconds for an ISO 8601 string, or None if it cannot be parsed."""
+    try:
+        # Handle both ISO format with and without 'Z'
+        if published_at.endswith('Z'):
+            published_at = published_at[:-1] + '+00:00'
+        parsed = datetime.fromisoformat(published_at)
+        # Ensure timezone aware
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return int(parsed.timestamp())
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class Article:
+    """One article. Construct with the same keys as the JSON schema."""
+
+    __slots__ = (
+        'id', 'title', 'source', 'url', 'published_at', 'published_ts', 'saved',
+        'summary', 'category',
+        'author', 'upvotes', 'subreddit', 'newsletter_issue',
+        'metadata_extra', 'extra'
+    )
+
+    def __init__(self, id, title, source, url, published_at, saved=None, metadata=_MISSING, **fields):
+        self.id = id
+        self.title = title
+        self.source = _intern(source)
+        self.url = url
+        self.published_at = published_at
+        self.published_ts = parse_timestamp(published_at)
+        # Not part of the stored record: None unless joined from saved_store
+        # (or read from a file written before saved state moved out)
+        self.saved = saved
+
+        extra = None
+        for name, value in fields.items():
+            if name in OPTIONAL_FIELDS:
+                setattr(self, name, _intern(value) if name in INTERNED_FIELDS else value)
+            else:
+                extra = extra or {}
+                extra[name] = value
+
+        # None: no metadata dict at all; (): metadata without unknown keys
+        if metadata is _MISSING or not isinstance(metadata, dict):
+            if metadata is not _MISSING:
+                extra = extra or {}
+                extra['metadata'] = metadata
+            self.metadata_extra = None
+        else:
+            metadata_extra = None
+            for name, value in metadata.items():
+                if name in METADATA_FIELDS:
+                    setattr(self, name, _intern(value) if name in INTERNED_FIELDS else value)
+                else:
+                    metadata_extra = metadata_extra or {}
+                    metadata_extra[name] = value
+            self.metadata_extra = metadata_extra or ()
+
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Article':
+        """Build an Article from a schema dict, raising ValueError if required fields are missing."""
+        missing = [name for name in REQUIRED_FIELDS if name not in data]
+        if missing:
+            raise ValueError(f"Missing required field(s): {', '.join(missing)}")
+        return cls(**data)
+
+    @classmethod
+    def coerce(cls, item) -> 'Article':
+        """Accept either an Article or a schema dict."""
+        return item if isinstance(item, cls) else cls.from_dict(item)
+
+    def get(self, name: str, default=None):
+        """Value of a field (top-level or metadata), or default if absent."""
+        return getattr(self, name, default)
+
+    @property
+    def metadata(self) -> Optional[Dict]:
+        """The metadata dict as it appears in the schema."""
+        if self.metadata_extra is None:
+            return None
+        metadata = {}
+        for name in METADATA_FIELDS:
+            value = getattr(self, name, _MISSING)
+            if value is not _MISSING:
+                metadata[name] = value
+        if self.metadata_extra:
+            metadata.update(self.metadata_extra)
+        return metadata
+
+    def to_dict(self) -> Dict:
+        """Schema dict, equal to the dict the article was built from."""
+        data = {
+            'id': self.id,
+            'title': self.title,
+            'source': self.source,
+            'url': self.url,
+            'published_at': self.published_at
+        }
+        if self.saved is not None:
+            data['saved'] = self.saved
+        for name in OPTIONAL_FIELDS:
+            value = getattr(self, name, _MISSING)
+            if value is not _MISSING:
+                data[name] = value
+        metadata = self.metadata
+        if metadata is not None:
+            data['metadata'] = metadata
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __repr__(self):
+        return f"Article(id={self.id!r}, source={self.source!r}, title={self.title[:40]!r})"
+
+
+def from_dicts(items: Iterable[Dict]) -> Tuple[List[Article], List[str]]:
+    """
+    Batch conversion with validation.
+    Returns the valid articles and one error message per rejected item.
+    """
+    required = frozenset(REQUIRED_FIELDS)
+    articles = []
+    errors = []
+    for index, item in enumerate(items):
+        if isinstance(item, Article):
+            articles.append(item)
+            continue
+        missing = required.difference(item)
+        if missing:
+            errors.append(f"#{index} {item.get('title', 'Unknown')}: missing {', '.join(sorted(missing))}")
+            continue
+        articles.append(Article(**item))
+    return articles, errors
+
+
+def to_dicts(articles: Iterable[Article]) -> List[Dict]:
+    """Schema dicts for JSON encoding."""
+    return [article.to_dict() for article in articles]
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Backfill: Crawl each source's paginated archive back to a given date and
+append everything to the history store (history_store.py).
+
+- Newsletters: /archive?page=N, newest first; article pages of one archive
+  page are fetched concurrently (at most BACKFILL_CONCURRENCY at a time)
+- Reddit: /r/<sub>/new.json?after=<cursor>, one listing page at a time
+
+Each source yields one archive page at a time and pages are appended in
+batches, so memory does not grow with the number of pages crawled. The
+cursor of the last durably appended page is checkpointed; an interrupted
+backfill resumes from there (use --restart to start over).
+"""
+
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Tuple
+
+from article import Article
+from history_store import HistoryWriter
+from parsers import parse_archive_links, parse_article_page
+from parse_pool import env_int, run_parse, parse_stream
+import content_store
+import metrics
+import scrape_bensbites
+import scrape_reddit
+import scrape_rundown
+
+# Path to the checkpoint of an in-progress backfill
+BACKFILL_CHECKPOINT_PATH = os.path.join(os.path.dirname(__file__), '..', '.tmp', 'backfill_checkpoint.json')
+
+# Concurrent article page fetches per source
+BACKFILL_CONCURRENCY = env_int('SCRAPER_BACKFILL_CONCURRENCY', 4, minimum=1)
+
+# Articles buffered before an append (and checkpoint)
+BACKFILL_BATCH_SIZE = 100
+
+# Safety stop per source (or subreddit)
+MAX_PAGES = 500
+
+# Posts per Reddit listing request (API maximum)
+REDDIT_PAGE_SIZE = 100
+
+# Newsletter scraper modules by checkpoint name
+NEWSLETTERS = {
+    'bensbites': scrape_bensbites,
+    'rundown': scrape_rundown,
+}
+
+
+def parse_since(value: str) -> int:
+    """Epoch seconds for a YYYY-MM-DD (UTC) or ISO 8601 date."""
+    parsed = datetime.fromisoformat(value[:-1] + '+00:00' if value.endswith('Z') else value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def crawl_newsletter(module, since_ts: int, cursor: int, executor: ThreadPoolExecutor) -> Iterator[Tuple[int, List[Article]]]:
+    """
+    Yield (next page, articles) for each archive page of a newsletter
+    scraper module, stopping at the first page reaching past since_ts.
+    """
+    page = cursor or 1
+    previous = None
+    for page in range(page, page + MAX_PAGES):
+        response = module.fetch_with_retry(f"{module.BASE_URL}/archive?page={page}", module.HEADERS)
+        links = run_parse(parse_archive_links, response.content, module.BASE_URL)
+        if not links or links == previous:
+            # Past the last page, or the archive ignores ?page=
+            return
+        previous = links
+
+        # Fetch concurrently (bounded by the executor), parse in the parse pool
+        contents = executor.map(lambda link: module.fetch_article_content(link[0], module.HEADERS), links)
+        failed = []
+
+        def page_jobs():
+            for link, content in zip(links, contents):
+                if content is None:
+                    # Undated without its page: it would be filed under the current month for good
+                    failed.append(link[0])
+                    continue
+                yield link, parse_article_page, (content, module.DEFAULT_AUTHOR, module.DETECT_AUTHOR, content_store.EXTRACT_TEXT)
+
+        articles = []
+        for (url, title), metadata in parse_stream(page_jobs()):
+            article = module.build_article(url, title, metadata)
+            content_store.store(article.id, metadata.get('text'))
+            articles.append(article)
+        if failed:
+            print(f"  ⚠️  Skipped {len(failed)} article(s) of archive page {page} whose page could not be fetched")
+            metrics.inc('backfill_skipped_articles_total', len(failed), source=module.__name__.replace('scrape_', ''))
+
+        # Archives are newest first: an older article means this is the last page needed
+        in_range = [a for a in articles if a.published_ts is None or a.published_ts >= since_ts]
+        yield page + 1, in_range
+        if len(in_range) < len(articles):
+            return
+        time.sleep(module.RATE_LIMIT_SECONDS)
+
+
+def crawl_reddit(since_ts: int, cursor: Dict) -> Iterator[Tuple[Dict, List[Article]]]:
+    """
+    Yield (cursor, articles) for each listing page of every subreddit.
+    The cursor maps subreddit -> `after` token, or True once it is done.
+    """
+    cursor = dict(cursor or {})
+    for subreddit in scrape_reddit.SUBREDDITS:
+        for _ in range(MAX_PAGES):
+            after = cursor.get(subreddit)
+            if after is True:
+                break
+            url = f"{scrape_reddit.BASE_URL}/r/{subreddit}/new.json?limit={REDDIT_PAGE_SIZE}"
+            if after:
+                url += f"&after={after}"
+
+            posts = scrape_reddit.fetch_listing(url)
+            articles = [scrape_reddit.build_article(post.get('data', {}), subreddit) for post in posts]
+            in_range = [a for a in articles if a.published_ts is None or a.published_ts >= since_ts]
+
+            last = posts[-1].get('data', {}).get('name') if posts else None
+            done = not last or last == after or len(in_range) < len(articles)
+            cursor[subreddit] = True if done else last
+            yield dict(cursor), in_range
+            if done:
+                break
+            time.sleep(scrape_reddit.RATE_LIMIT_SECONDS)
+
+
+def load_backfill_checkpoint(since: str) -> Dict:
+    """Checkpoint of an interrupted backfill to the same date, or a fresh one."""
+    fresh = {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "since": since,
+        "sources": {}
+    }
+
+    if not os.path.exists(BACKFILL_CHECKPOINT_PATH):
+        return fresh
+
+    try:
+        with open(BACKFILL_CHECKPOINT_PATH, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+        if checkpoint.get('since') != since:
+            print(f"⚠️  Discarding checkpoint of a backfill since {checkpoint.get('since')}")
+            return fresh
+        print(f"🔄 Resuming backfill started at {checkpoint['started_at']}")
+        return checkpoint
+    except (json.JSONDecodeError, KeyError, ValueError) as e:
+        print(f"⚠️  Ignoring unreadable backfill checkpoint: {e}")
+        return fresh
+
+
+def save_backfill_checkpoint(checkpoint: Dict) -> None:
+    """Write the checkpoint atomically."""
+    os.makedirs(os.path.dirname(BACKFILL_CHECKPOINT_PATH), exist_ok=True)
+    temp_path = BACKFILL_CHECKPOINT_PATH + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+    shutil.move(temp_path, BACKFILL_CHECKPOINT_PATH)
+
+
+def clear_backfill_checkpoint() -> None:
+    """Remove the checkpoint once a backfill has completed."""
+    if os.path.exists(BACKFILL_CHECKPOINT_PATH):
+        os.remove(BACKFILL_CHECKPOINT_PATH)
+
+
+def backfill_source(name: str, pages: Iterator, state: Dict, checkpoint: Dict, writer: HistoryWriter) -> None:
+    """Append a source's pages in batches, checkpointing the cursor after each append."""
+    buffer = []
+    cursor = state.get('cursor')
+
+    def flush():
+        state['articles'] = state.get('articles', 0) + writer.append(buffer)
+        state['cursor'] = cursor
+        save_backfill_checkpoint(checkpoint)
+        buffer.clear()
+
+    for cursor, articles in pages:
+        state['pages'] = state.get('pages', 0) + 1
+        metrics.inc('backfill_pages_total', source=name)
+        metrics.inc('backfill_articles_total', len(articles), source=name)
+        buffer.extend(articles)
+        if len(buffer) >= BACKFILL_BATCH_SIZE:
+            flush()
+            print(f"  💾 {name}: {state['pages']} pages, {state['articles']} new articles")
+
+    state['done'] = True
+    flush()
+
+
+def run_backfill(since: str, sources: List[str] = None, concurrency: int = None, restart: bool = False) -> Dict:
+    """Backfill history for the given sources back to `since`. Returns per-source stats."""
+    since_ts = parse_since(since)
+    sources = sources or ['bensbites', 'rundown', 'reddit']
+    if restart:
+        clear_backfill_checkpoint()
+    checkpoint = load_backfill_checkpoint(since)
+    writer = HistoryWriter()
+    errors = []
+
+    print(f"⏪ Backfilling {', '.join(sources)} since {since}")
+    with ThreadPoolExecutor(max_workers=concurrency or BACKFILL_CONCURRENCY) as executor:
+        for name in sources:
+            state = checkpoint['sources'].setdefault(name, {})
+            if state.get('done'):
+                print(f"⏭️  {name}: already completed in checkpointed backfill")
+                continue
+
+            print(f"🔍 {name} (from {state.get('cursor') or 'the newest page'})")
+            if name == 'reddit':
+                pages = crawl_reddit(since_ts, state.get('cursor'))
+            else:
+                pages = crawl_newsletter(NEWSLETTERS[name], since_ts, state.get('cursor'), executor)
+
+            try:
+                with metrics.timed('backfill_source_duration_seconds', source=name):
+                    backfill_source(name, pages, state, checkpoint, writer)
+                print(f"✅ {name}: {state.get('pages', 0)} pages, {state.get('articles', 0)} new articles")
+            except Exception as e:
+                error_msg = f"{name} backfill failed: {e}"
+                print(f"❌ {error_msg} (resume from the checkpoint)")
+                errors.append(error_msg)
+
+    if not errors:
+        clear_backfill_checkpoint()
+    return {'since': since, 'written': writer.written, 'sources': checkpoint['sources'], 'errors': errors}
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Content Store: Full article text, kept apart from articles.json.
+
+Texts are stored once per distinct content as gzip blobs named by their
+SHA-256, content/blobs/<ab>/<sha256>.txt.gz; an append-only index,
+content/index.jsonl, maps article IDs to blob hashes (last line wins).
+Re-storing unchanged text writes nothing. The dashboard serves a blob as
+is (already gzip) from /api/articles/<id>/content.
+
+Extraction is optional: set SCRAPER_EXTRACT_TEXT=1 (or run manager.py
+with --extract-text) to have the newsletter scrapers store page text.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+from snapshots import fsync_dir
+
+# Directory holding the blobs and the index
+CONTENT_DIR = os.path.join(os.path.dirname(__file__), '..', 'content')
+
+# Extract and store full text while scraping
+EXTRACT_TEXT = os.environ.get('SCRAPER_EXTRACT_TEXT', '0') == '1'
+
+# Blobs are written once and read many times
+COMPRESS_LEVEL = 9
+
+# Index read so far: {'path', 'offset', 'key' (mtime_ns, size), 'ids': {id: sha256}}
+_index_cache = {'path': None, 'offset': 0, 'key': None, 'ids': {}}
+
+
+def index_path() -> str:
+    return os.path.join(CONTENT_DIR, 'index.jsonl')
+
+
+def blob_path(digest: str) -> str:
+    return os.path.join(CONTENT_DIR, 'blobs', digest[:2], f"{digest}.txt.gz")
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 (hex) of the UTF-8 text."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def put_blob(text: str) -> str:
+    """Store text as a compressed blob (once per distinct text). Returns its hash."""
+    digest = content_hash(text)
+    path = blob_path(digest)
+    if os.path.exists(path):
+        return digest
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            # mtime=0: identical text always gives identical bytes
+            f.write(gzip.compress(text.encode('utf-8'), compresslevel=COMPRESS_LEVEL, mtime=0))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        fsync_dir(path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return digest
+
+
+def load_index() -> Dict[str, str]:
+    """
+    article ID -> blob hash. The index only grows, so lines appended since
+    the last call are read and nothing else.
+    """
+    path = index_path()
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return {}
+
+    cache = _index_cache
+    key = (stat.st_mtime_ns, stat.st_size)
+    if cache['path'] == path and cache['key'] == key:
+        return cache['ids']
+    if cache['path'] != path or stat.st_size < cache['offset']:
+        cache.update(path=path, offset=0, ids={})  # first read, or the index was replaced
+
+    with open(path, 'rb') as f:
+        f.seek(cache['offset'])
+        for line in f:
+            if not line.endswith(b'\n'):
+                break  # append in progress: read it next time
+            cache['offset'] += len(line)
+            try:
+                entry = json.loads(line)
+                cache['ids'][entry['id']] = entry['sha256']
+            except (ValueError, KeyError, TypeError):
+                continue
+    cache['key'] = key
+    return cache['ids']
+
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+
+def store(article_id: str, text: Optional[str]) -> Optional[str]:
+    """Store an article's text and point its index entry at it. Returns the hash."""
+    if not text:
+        return None
+    digest = put_blob(text)
+    if load_index().get(article_id) == digest:
+        return digest
+
+    line = json.dumps({'id': article_id, 'sha256': digest}) + '\n'
+    with open(index_path(), 'ab') as f:
+        if f.tell() and not _ends_with_newline(index_path()):
+            f.write(b'\n')  # close a torn line left by an interrupted append
+        f.write(line.encode('utf-8'))
+        f.flush()
+        os.fsync(f.fileno())
+    return digest
+
+
+def content_digest(article_id: str) -> Optional[str]:
+    """Blob hash of an article's text, or None if none was stored."""
+    return load_index().get(article_id)
+
+
+def read_blob(digest: str) -> bytes:
+    """Compressed (gzip) bytes of a blob."""
+    with open(blob_path(digest), 'rb') as f:
+        return f.read()
+
+
+def read_text(article_id: str) -> Optional[str]:
+    """Full text of an article, or None if none was stored."""
+    digest = content_digest(article_id)
+    if digest is None:
+        return None
+    return gzip.decompress(read_blob(digest)).decode('utf-8')
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+History Store: Append-only archive of every article ever collected.
+articles.json only keeps the last 24 hours (plus saved articles); history
+keeps one JSON line per article in monthly files, history/YYYY-MM.jsonl
+(by published_at), for search and analytics.
+
+Appends are batched and fsynced; an article ID is written at most once per
+month file, so re-crawling a page after an interrupted backfill is harmless.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, Optional, Set
+
+from article import Article
+
+# Directory holding the monthly history files
+HISTORY_DIR = os.path.join(os.path.dirname(__file__), '..', 'history')
+
+# Partition for articles whose published_at could not be parsed
+UNDATED = 'undated'
+
+
+def partition(article: Article) -> str:
+    """Monthly partition name (YYYY-MM) of an article."""
+    if article.published_ts is None:
+        return UNDATED
+    return datetime.fromtimestamp(article.published_ts, tz=timezone.utc).strftime('%Y-%m')
+
+
+def partition_path(name: str) -> str:
+    return os.path.join(HISTORY_DIR, f"{name}.jsonl")
+
+
+def _read_ids(path: str) -> Set[str]:
+    ids = set()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    ids.add(json.loads(line)['id'])
+                except (ValueError, KeyError, TypeError):
+                    continue  # torn last line of an interrupted append
+    except FileNotFoundError:
+        pass
+    return ids
+
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+
+class HistoryWriter:
+    """
+    Batched, de-duplicating appender.
+    Only the IDs of the months it has written to are held in memory.
+    """
+
+    def __init__(self):
+        self._ids = {}  # partition -> set of stored IDs
+        self.written = 0
+
+    def append(self, articles: Iterable[Article]) -> int:
+        """Append articles not yet in history. Returns the number written."""
+        by_partition = {}
+        for article in articles:
+            by_partition.setdefault(partition(article), []).append(article)
+
+        written = 0
+        os.makedirs(HISTORY_DIR, exist_ok=True)
+        for name, batch in sorted(by_partition.items()):
+            path = partition_path(name)
+            if name not in self._ids:
+                self._ids[name] = _read_ids(path)
+            ids = self._ids[name]
+
+            lines = []
+            for article in batch:
+                if article.id in ids:
+                    continue
+                ids.add(article.id)
+                lines.append(json.dumps(article.to_dict(), sort_keys=True, ensure_ascii=False) + '\n')
+            if not lines:
+                continue
+
+            with open(path, 'a', encoding='utf-8') as f:
+                if f.tell() and not _ends_with_newline(path):
+                    f.write('\n')  # close a torn line left by an interrupted append
+                f.writelines(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            written += len(lines)
+
+        self.written += written
+        return written
+
+
+def partitions() -> Iterator[str]:
+    """Stored partition names, oldest first (undated last)."""
+    try:
+        names = sorted(name[:-6] for name in os.listdir(HISTORY_DIR) if name.endswith('.jsonl'))
+    except FileNotFoundError:
+        return iter(())
+    return iter(sorted(names, key=lambda name: (name == UNDATED, name)))
+
+
+def iter_history(since: Optional[str] = None) -> Iterator[Article]:
+    """Stream stored articles, optionally only partitions from `since` (YYYY-MM) on."""
+    for name in partitions():
+        if since and name != UNDATED and name < since:
+            continue
+        with open(partition_path(name), 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield Article.from_dict(json.loads(line))
+                except (ValueError, TypeError):
+                    continue
+
+
+def counts() -> Dict[str, int]:
+    """Number of stored articles per partition."""
+    result = {}
+    for name in partitions():
+        with open(partition_path(name), 'rb') as f:
+            result[name] = sum(1 for _ in f)
+    return result
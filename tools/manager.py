@@ -1,117 +1,172 @@
 #!/usr/bin/env python3
 """
 Manager: Orchestrates all scrapers with fault tolerance and 24h filtering
+Scrapers stream into a checkpointed pipeline of batched writes.
+
+Usage:
+  python tools/manager.py                              # daily run
+  python tools/manager.py backfill --since 2024-01-01  # history backfill
 """
 
+import argparse
 import sys
 import os
+import json
+import time
 from datetime import datetime, timezone, timedelta
 
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(__file__))
 
-from storage_manager import load_articles, save_articles, merge_articles
-from scrape_bensbites import scrape_bensbites
-from scrape_rundown import scrape_rundown
-from scrape_reddit import scrape_reddit
+from article import Article
+from pipeline import CheckpointedWriter, load_checkpoint, filter_stage, batch_stage
+from parse_pool import shutdown_pool
+from storage_manager import read_content_hash, migrate_saved_flags
+from saved_store import all_saved_ids
+from run_log import append_run
+import metrics
+import content_store
+from scrape_bensbites import iter_bensbites
+from scrape_rundown import iter_rundown
+from scrape_reddit import iter_reddit
 
 
-def filter_last_24h(articles: list) -> list:
+def is_within_24h(article: Article, cutoff_ts: int, saved_ids: frozenset = frozenset()) -> bool:
     """
-    Filter articles to only include those from the last 24 hours.
-    Exception: Always keep articles with saved=True.
+    Check whether an article belongs in the 24 hour window.
+    Exception: Always keep articles saved by any user (saved_ids).
     """
-    cutoff_time = datetime.now(timezone.utc) - timedelta(hours=24)
-    filtered = []
+    # Always keep saved articles
+    if article.id in saved_ids:
+        return True
     
-    for article in articles:
-        # Always keep saved articles
-        if article.get('saved', False):
-            filtered.append(article)
+    if article.published_ts is None:
+        print(f"⚠️  Could not parse date for {article.title}: {article.published_at!r}")
+        # Include article if we can't parse date (fail safe)
+        return True
+    
+    return article.published_ts >= cutoff_ts
+
+
+def cutoff_timestamp(hours: int = 24) -> int:
+    """Epoch seconds of the start of the retention window."""
+    return int((datetime.now(timezone.utc) - timedelta(hours=hours)).timestamp())
+
+
+def filter_last_24h(articles: list, saved_ids: frozenset = None) -> list:
+    """
+    Filter articles to only include those from the last 24 hours.
+    Exception: Always keep saved articles (saved_ids defaults to the saved store).
+    Accepts Articles or schema dicts; returns Articles.
+    """
+    cutoff_ts = cutoff_timestamp()
+    if saved_ids is None:
+        saved_ids = all_saved_ids()
+    return [article for article in map(Article.coerce, articles) if is_within_24h(article, cutoff_ts, saved_ids)]
+
+
+# Machine-readable report of the last run
+RUN_REPORT_PATH = os.path.join(os.path.dirname(__file__), '..', '.tmp', 'run_report.json')
+
+# (checkpoint name, display name, generator)
+SOURCES = [
+    ('bensbites', "Ben's Bites", iter_bensbites),
+    ('rundown', "The AI Rundown", iter_rundown),
+    ('reddit', "Reddit", iter_reddit),
+]
+
+
+def stream_sources(writer: CheckpointedWriter, errors: list, counts: dict, source_stats: dict):
+    """
+    Chain all scraper generators into one article stream.
+    Logs errors but continues if one scraper fails; sources completed by an
+    interrupted run are skipped. Per-source time excludes downstream commits.
+    """
+    for index, (name, display_name, scraper) in enumerate(SOURCES, start=1):
+        print(f"{index}\ufe0f\u20e3  {display_name}")
+        print("-" * 60)
+        
+        if name in writer.checkpoint['completed_sources']:
+            print("⏭️  Already completed in checkpointed run")
+            print()
             continue
         
-        # Parse published_at
+        stats = {'fetched': 0, 'status': 'ok'}
+        start = time.perf_counter()
+        commit_seconds_before = writer.commit_seconds
         try:
-            # Handle both ISO format with and without 'Z'
-            pub_str = article['published_at']
-            if pub_str.endswith('Z'):
-                pub_str = pub_str[:-1] + '+00:00'
-            
-            published_at = datetime.fromisoformat(pub_str)
-            
-            # Ensure timezone aware
-            if published_at.tzinfo is None:
-                published_at = published_at.replace(tzinfo=timezone.utc)
-            
-            # Check if within 24h
-            if published_at >= cutoff_time:
-                filtered.append(article)
-                
+            for article in scraper(skip_ids=writer.skip_ids):
+                counts['fetched'] += 1
+                stats['fetched'] += 1
+                yield article
+            writer.mark_source_complete(name)
         except Exception as e:
-            print(f"⚠️  Could not parse date for {article.get('title', 'Unknown')}: {e}")
-            # Include article if we can't parse date (fail safe)
-            filtered.append(article)
-    
-    return filtered
+            error_msg = f"{display_name} scraper failed: {e}"
+            print(f"❌ {error_msg}")
+            errors.append(error_msg)
+            stats['status'] = 'error'
+        
+        elapsed = time.perf_counter() - start - (writer.commit_seconds - commit_seconds_before)
+        stats['seconds'] = round(elapsed, 3)
+        source_stats[name] = stats
+        metrics.observe('scraper_source_duration_seconds', elapsed, source=name)
+        metrics.inc('scraper_articles_fetched_total', stats['fetched'], source=name)
+        print()
+
+
+def count_stage(articles, counts: dict, key: str):
+    """Pass-through stage counting the articles that reach it."""
+    for article in articles:
+        counts[key] += 1
+        yield article
 
 
 def run_scrapers():
     """
-    Run all scrapers with fault tolerance.
-    Logs errors but continues if one scraper fails.
+    Run all scrapers as a streaming pipeline with fault tolerance.
+    Articles are filtered to the last 24h, merged and saved in batches,
+    with a checkpoint so a restarted run skips what it already stored.
     """
     print("=" * 60)
     print("🚀 AI News Dashboard - Scraper Manager")
     print("=" * 60)
     print()
     
-    all_articles = []
+    started_at = datetime.now(timezone.utc)
+    run_start = time.perf_counter()
     errors = []
+    counts = {'fetched': 0, 'filtered': 0}
+    source_stats = {}
+    cutoff_ts = cutoff_timestamp()
     
-    # Run Ben's Bites scraper
-    print("1️⃣  Ben's Bites")
-    print("-" * 60)
-    try:
-        bb_articles = scrape_bensbites()
-        all_articles.extend(bb_articles)
-        print()
-    except Exception as e:
-        error_msg = f"Ben's Bites scraper failed: {e}"
-        print(f"❌ {error_msg}")
-        errors.append(error_msg)
-        print()
+    hash_before = read_content_hash()
+    # Legacy saved flags must reach the saved store before retention reads it
+    migrate_saved_flags()
+    writer = CheckpointedWriter(load_checkpoint())
+    saved_ids = all_saved_ids()
     
-    # Run The AI Rundown scraper
-    print("2️⃣  The AI Rundown")
-    print("-" * 60)
-    try:
-        rd_articles = scrape_rundown()
-        all_articles.extend(rd_articles)
-        print()
-    except Exception as e:
-        error_msg = f"The AI Rundown scraper failed: {e}"
-        print(f"❌ {error_msg}")
-        errors.append(error_msg)
-        print()
+    # scrape -> checkpoint -> 24h filter -> batch -> merge + save
+    stream = stream_sources(writer, errors, counts, source_stats)
+    stream = writer.mark_seen(stream)
+    stream = filter_stage(stream, lambda article: is_within_24h(article, cutoff_ts, saved_ids))
+    stream = count_stage(stream, counts, 'filtered')
     
-    # Run Reddit scraper
-    print("3️⃣  Reddit")
-    print("-" * 60)
-    try:
-        reddit_articles = scrape_reddit()
-        all_articles.extend(reddit_articles)
-        print()
-    except Exception as e:
-        error_msg = f"Reddit scraper failed: {e}"
-        print(f"❌ {error_msg}")
-        errors.append(error_msg)
+    save_failed = False
+    for batch in batch_stage(stream):
+        print(f"💾 Staging batch of {len(batch)} articles...")
+        if not writer.commit(batch):
+            save_failed = True
+            print("❌ Failed to save batch")
         print()
     
+    shutdown_pool()
+    
     # Summary
     print("=" * 60)
     print(f"📊 Scraping Summary")
     print("=" * 60)
-    print(f"Total articles fetched: {len(all_articles)}")
+    print(f"Total articles fetched: {counts['fetched']}")
+    print(f"Kept {counts['filtered']} articles (within 24h or saved)")
     
     if errors:
         print(f"⚠️  Errors encountered: {len(errors)}")
@@ -122,63 +177,128 @@ def run_scrapers():
     
     print()
     
-    # Filter to last 24h
-    print("🔍 Filtering to last 24 hours...")
-    filtered_articles = filter_last_24h(all_articles)
-    print(f"   Kept {len(filtered_articles)} articles (within 24h or saved)")
-    print()
-    
-    # Load existing articles and merge
-    print("💾 Merging with existing articles...")
-    existing_data = load_articles()
-    existing_articles = existing_data.get('articles', [])
-    
-    merged_articles = merge_articles(existing_articles, filtered_articles)
-    print(f"   Total articles after merge: {len(merged_articles)}")
-    print()
-    
-    # Save to storage
-    print("💾 Saving to storage...")
-    success = save_articles(merged_articles)
+    # Single write of the staged articles (retention applied), checkpoint cleanup
+    print("💾 Finalizing storage...")
+    success = not save_failed and writer.finish()
+    print(f"   Total articles in storage: {writer.total}")
     
     if success:
         print("✅ Articles saved successfully")
     else:
-        print("❌ Failed to save articles")
+        print("❌ Failed to save articles (checkpoint kept for resume)")
     
     print()
     print("=" * 60)
     print("🎉 Scraping complete!")
     print("=" * 60)
     
-    # Log to progress.md
-    log_to_progress(len(all_articles), len(filtered_articles), len(merged_articles), errors)
+    changed = read_content_hash() != hash_before
+    if not changed:
+        print("ℹ️  Article set unchanged, storage left untouched")
+    
+    log_run(counts['fetched'], counts['filtered'], writer.total, errors, changed)
+    
+    write_run_report({
+        'started_at': started_at.isoformat(),
+        'duration_seconds': round(time.perf_counter() - run_start, 3),
+        'success': success,
+        'fetched': counts['fetched'],
+        'filtered': counts['filtered'],
+        'total': writer.total,
+        'commits': writer.commits,
+        'changed': changed,
+        'sources': source_stats,
+        'errors': errors,
+        'metrics': metrics.snapshot()
+    })
+
+
+def write_run_report(report: dict):
+    """Write the JSON run report (timings, counts and metrics)"""
+    try:
+        os.makedirs(os.path.dirname(RUN_REPORT_PATH), exist_ok=True)
+        with open(RUN_REPORT_PATH, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"📈 Run report written to {os.path.normpath(RUN_REPORT_PATH)}")
+    except Exception as e:
+        print(f"⚠️  Could not write run report: {e}")
+
+
+def log_run(fetched: int, filtered: int, total: int, errors: list, changed: bool):
+    """Record the run in the rotating run log (logs/runs.jsonl)"""
+    try:
+        append_run({
+            'fetched': fetched,
+            'filtered': filtered,
+            'total': total,
+            'changed': changed,
+            'errors': errors
+        })
+    except Exception as e:
+        print(f"⚠️  Could not write run log: {e}")
 
 
-def log_to_progress(fetched: int, filtered: int, total: int, errors: list):
-    """Log execution to progress.md"""
-    progress_path = os.path.join(os.path.dirname(__file__), '..', 'progress.md')
+def backfill(since: str, sources: list = None, concurrency: int = None, restart: bool = False):
+    """Crawl archives back to `since` into the history store and log the run"""
+    from backfill import run_backfill
     
-    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+    print("=" * 60)
+    print("⏪ AI News Dashboard - Backfill")
+    print("=" * 60)
     
-    log_entry = f"\n## [{timestamp}] Scraper Run\n"
-    log_entry += f"- Fetched: {fetched} articles\n"
-    log_entry += f"- Filtered (24h): {filtered} articles\n"
-    log_entry += f"- Total in storage: {total} articles\n"
+    result = run_backfill(since, sources, concurrency, restart)
     
-    if errors:
-        log_entry += f"- Errors: {len(errors)}\n"
-        for error in errors:
-            log_entry += f"  - {error}\n"
-    else:
-        log_entry += "- Status: ✅ All scrapers successful\n"
+    print()
+    print(f"📊 {result['written']} new articles written to history")
+    if result['errors']:
+        print(f"⚠️  {len(result['errors'])} source(s) failed; run again to resume")
     
     try:
-        with open(progress_path, 'a', encoding='utf-8') as f:
-            f.write(log_entry)
+        append_run({'mode': 'backfill', 'since': since, 'written': result['written'], 'errors': result['errors']})
     except Exception as e:
-        print(f"⚠️  Could not log to progress.md: {e}")
+        print(f"⚠️  Could not write run log: {e}")
+    return result
 
 
-if __name__ == "__main__":
+def positive_int(value: str) -> int:
+    """argparse type: an integer >= 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected an integer >= 1, got {value!r}")
+    return number
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="AI News scraper manager")
+    parser.add_argument('--extract-text', action='store_true',
+                        help="store newsletter article text in the content store (default SCRAPER_EXTRACT_TEXT)")
+    commands = parser.add_subparsers(dest='command')
+    backfill_parser = commands.add_parser('backfill', help="crawl paginated archives into the history store")
+    backfill_parser.add_argument('--since', required=True, help="oldest date to collect (YYYY-MM-DD, UTC)")
+    backfill_parser.add_argument('--sources', default='bensbites,rundown,reddit', help="comma-separated sources")
+    backfill_parser.add_argument('--concurrency', type=positive_int, default=None,
+                                 help="concurrent page fetches (default SCRAPER_BACKFILL_CONCURRENCY)")
+    backfill_parser.add_argument('--restart', action='store_true', help="ignore an interrupted backfill's checkpoint")
+    commands.add_parser('migrate-saved', help="move saved flags of an old articles.json to saved/default.json")
+    args = parser.parse_args(argv)
+    if args.extract_text:
+        content_store.EXTRACT_TEXT = True
+    
+    if args.command == 'migrate-saved':
+        print(f"✅ Migrated {migrate_saved_flags()} saved flag(s)")
+        return 0
+    
+    if args.command == 'backfill':
+        result = backfill(args.since, args.sources.split(','), args.concurrency, args.restart)
+        shutdown_pool()
+        return 1 if result['errors'] else 0
+    
     run_scrapers()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Metrics: In-process counters and histograms for the scrapers and the server.
+Rendered as Prometheus text by serve_dashboard.py (/metrics) and as JSON in
+the run report written by manager.py.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Tuple
+from urllib.parse import urlparse
+
+# Latency buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_counters: Dict[Tuple[str, tuple], float] = {}
+_histograms: Dict[Tuple[str, tuple], dict] = {}
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def inc(name: str, value: float = 1, **labels) -> None:
+    """Increment a counter."""
+    key = (name, _label_key(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name: str, value: float, **labels) -> None:
+    """Record a value in a histogram."""
+    key = (name, _label_key(labels))
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = {'buckets': [0] * len(DEFAULT_BUCKETS), 'sum': 0.0, 'count': 0}
+            _histograms[key] = hist
+        for i, bound in enumerate(DEFAULT_BUCKETS):
+            if value <= bound:
+                hist['buckets'][i] += 1
+        hist['sum'] += value
+        hist['count'] += 1
+
+
+@contextmanager
+def timed(name: str, **labels):
+    """Time the enclosed block into a histogram."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+
+def observe_http(url: str, seconds: float, nbytes: int, status) -> None:
+    """Record one outbound HTTP request."""
+    host = urlparse(url).netloc
+    observe('scraper_http_request_duration_seconds', seconds, host=host)
+    inc('scraper_http_requests_total', host=host, status=status)
+    inc('scraper_http_response_bytes_total', nbytes, host=host)
+
+
+def reset() -> None:
+    """Clear all recorded metrics."""
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def _format_labels(labels: tuple, extra: tuple = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ''
+    escaped = (
+        (k, v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for k, v in pairs
+    )
+    return '{' + ','.join(f'{k}="{v}"' for k, v in escaped) + '}'
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus() -> str:
+    """Render all metrics in the Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        counters = sorted(_counters.items())
+        histograms = sorted((key, dict(hist, buckets=list(hist['buckets']))) for key, hist in _histograms.items())
+
+    last_name = None
+    for (name, labels), value in counters:
+        if name != last_name:
+            lines.append(f'# TYPE {name} counter')
+            last_name = name
+        lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+
+    last_name = None
+    for (name, labels), hist in histograms:
+        if name != last_name:
+            lines.append(f'# TYPE {name} histogram')
+            last_name = name
+        for bound, count in zip(DEFAULT_BUCKETS, hist['buckets']):
+            lines.append(f'{name}_bucket{_format_labels(labels, (("le", str(bound)),))} {count}')
+        lines.append(f'{name}_bucket{_format_labels(labels, (("le", "+Inf"),))} {hist["count"]}')
+        lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(hist["sum"])}')
+        lines.append(f'{name}_count{_format_labels(labels)} {hist["count"]}')
+
+    return '\n'.join(lines) + '\n'
+
+
+def snapshot() -> dict:
+    """Return all metrics as a JSON-serializable dict."""
+    result = {'counters': {}, 'histograms': {}}
+    with _lock:
+        for (name, labels), value in sorted(_counters.items()):
+            result['counters'].setdefault(name, []).append({'labels': dict(labels), 'value': value})
+        for (name, labels), hist in sorted(_histograms.items()):
+            result['histograms'].setdefault(name, []).append({
+                'labels': dict(labels),
+                'count': hist['count'],
+                'sum': round(hist['sum'], 6),
+                'buckets': {str(bound): count for bound, count in zip(DEFAULT_BUCKETS, hist['buckets'])}
+            })
+    return result
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Parse Pool: Runs CPU-bound HTML parsing in worker processes.
+Scrapers keep fetching on the main thread while raw response bytes are
+parsed in parallel; only the compact extracted fields come back.
+
+Configuration (environment):
+- SCRAPER_PARSE_WORKERS: number of worker processes (0 parses inline)
+- SCRAPER_PARSE_MAX_PENDING: max pages in flight before fetching blocks
+"""
+
+import atexit
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Tuple
+
+from metrics import observe
+
+
+def env_int(name: str, default: int, minimum: int = 0) -> int:
+    """Integer setting from the environment; an invalid value falls back to default with a warning."""
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        value = None
+    if value is None or value < minimum:
+        print(f"⚠️  Ignoring {name}={raw!r} (expected an integer >= {minimum}), using {default}")
+        return default
+    return value
+
+
+PARSE_WORKERS = env_int('SCRAPER_PARSE_WORKERS', os.cpu_count() or 1)
+PARSE_MAX_PENDING = env_int('SCRAPER_PARSE_MAX_PENDING', 2 * max(PARSE_WORKERS, 1), minimum=1)
+
+_executor = None
+
+
+def get_executor():
+    """Return the shared process pool, creating it on first use (None when inline)."""
+    global _executor
+    if PARSE_WORKERS <= 0:
+        return None
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+    return _executor
+
+
+def shutdown_pool() -> None:
+    """Stop the worker processes."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+atexit.register(shutdown_pool)
+
+
+def _timed_call(func: Callable, args: tuple) -> Tuple[Any, float]:
+    """Worker entry point: run func and report how long it took."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def _record(func: Callable, timed_result: Tuple[Any, float]) -> Any:
+    """Record the worker-side parse time in this process and unwrap the result."""
+    result, seconds = timed_result
+    observe('scraper_parse_duration_seconds', seconds, parser=func.__name__)
+    return result
+
+
+def run_parse(func: Callable, *args) -> Any:
+    """Run a single parse job in the pool and wait for its result."""
+    executor = get_executor()
+    if executor is None:
+        return _record(func, _timed_call(func, args))
+    return _record(func, executor.submit(_timed_call, func, args).result())
+
+
+def parse_stream(jobs: Iterable[Tuple[Any, Callable, tuple]], max_pending: int = None) -> Iterator[Tuple[Any, Any]]:
+    """
+    Parse a stream of (key, func, args) jobs, yielding (key, result) in order.
+    At most max_pending jobs are in flight; the jobs iterable (which does the
+    network fetching) is only advanced when there is room, giving backpressure.
+    """
+    executor = get_executor()
+    if executor is None:
+        for key, func, args in jobs:
+            yield key, _record(func, _timed_call(func, args))
+        return
+
+    max_pending = max_pending or PARSE_MAX_PENDING
+    pending = deque()
+
+    for key, func, args in jobs:
+        pending.append((key, func, executor.submit(_timed_call, func, args)))
+        if len(pending) >= max_pending:
+            done_key, done_func, future = pending.popleft()
+            yield done_key, _record(done_func, future.result())
+
+    while pending:
+        done_key, done_func, future = pending.popleft()
+        yield done_key, _record(done_func, future.result())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Parsers: Pure HTML parsing functions shared by the newsletter scrapers.
+They take raw response bytes and return compact, picklable fields so they
+can run inside the parse pool (see parse_pool.py).
+"""
+
+import re
+from bs4 import BeautifulSoup
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+# Elements that never hold article text
+NON_CONTENT_TAGS = ['script', 'style', 'noscript', 'template', 'nav', 'header', 'footer',
+                    'aside', 'form', 'iframe', 'svg', 'button']
+
+# Elements whose text makes up the article body
+TEXT_BLOCK_TAGS = ['p', 'h1', 'h2', 'h3', 'h4', 'li', 'blockquote', 'pre']
+
+# Longest full text kept per article
+MAX_TEXT_CHARS = 100_000
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def parse_archive_links(content: bytes, base_url: str) -> List[Tuple[str, str]]:
+    """
+    Extract unique (article_url, title) pairs from an archive page.
+    Links use the /p/ pattern; relative URLs are made absolute with base_url.
+    """
+    soup = BeautifulSoup(content, 'lxml')
+
+    # Find all article links (they use /p/ pattern)
+    article_links = soup.find_all('a', href=lambda x: x and '/p/' in x)
+
+    # Deduplicate by href
+    seen_urls = set()
+    links = []
+    for link in article_links:
+        href = link.get('href')
+        if href in seen_urls:
+            continue
+        seen_urls.add(href)
+
+        # Make absolute URL
+        article_url = f"{base_url}{href}" if href.startswith('/') else href
+        links.append((article_url, link.get_text(strip=True)))
+
+    return links
+
+
+def extract_main_text(soup: BeautifulSoup) -> str:
+    """
+    Main text of a page: the top-level text blocks of its <article> (or
+    <main>, or <body>), one paragraph per block, chrome removed.
+    Modifies soup.
+    """
+    for tag in soup.find_all(NON_CONTENT_TAGS):
+        tag.decompose()
+
+    root = soup.find('article') or soup.find('main') or soup.body or soup
+    paragraphs = []
+    for block in root.find_all(TEXT_BLOCK_TAGS):
+        if block.find_parent(TEXT_BLOCK_TAGS) is not None:
+            continue  # already part of an enclosing block (e.g. <p> in <li>)
+        text = _WHITESPACE_RE.sub(' ', block.get_text(' ', strip=True))
+        if text:
+            paragraphs.append(text)
+
+    return '\n\n'.join(paragraphs)[:MAX_TEXT_CHARS]
+
+
+def parse_article_page(content: Optional[bytes], default_author: str, detect_author: bool = False,
+                       extract_text: bool = False) -> dict:
+    """
+    Extract published_at, summary and author from an article page, plus the
+    main text as 'text' when extract_text is set.
+    Falls back to defaults when content is None or cannot be parsed.
+    """
+    published_at = datetime.now(timezone.utc).isoformat()
+    summary = ""
+    author = default_author
+
+    text = ''
+
+    if content is None:
+        return {'published_at': published_at, 'summary': summary, 'author': author, 'text': text}
+
+    try:
+        soup = BeautifulSoup(content, 'lxml')
+
+        # Try to find published date (Substack/Beehiiv use <time> tag)
+        time_tag = soup.find('time')
+        if time_tag and time_tag.get('datetime'):
+            published_at = time_tag['datetime']
+
+        # Try to find summary/description (meta tag)
+        meta_desc = soup.find('meta', {'property': 'og:description'}) or \
+                    soup.find('meta', {'name': 'description'})
+        summary = meta_desc['content'] if meta_desc else ""
+
+        # Truncate summary to 200 chars
+        if len(summary) > 200:
+            summary = summary[:197] + "..."
+
+        # Try to find author
+        if detect_author:
+            author_tag = soup.find('meta', {'property': 'article:author'}) or \
+                         soup.find('a', {'class': 'author'})
+            author = author_tag.get('content', default_author) if author_tag else default_author
+
+        # Full text last: extraction strips elements from the tree
+        if extract_text:
+            text = extract_main_text(soup)
+
+    except Exception as e:
+        print(f"⚠️  Could not parse article page: {e}")
+
+    return {'published_at': published_at, 'summary': summary, 'author': author, 'text': text}
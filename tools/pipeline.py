@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Pipeline: Streaming stages between the scrapers and storage.
+Articles flow scraper generator -> filter -> batch -> checkpointed stage.
+Batches are appended to a staging file in .tmp/ as they complete, so while
+scraping only the current batch and the run's article IDs are in memory.
+articles.json is written once, when the run finishes: the staged articles
+are read back and merged with the stored corpus (memory O(corpus + run),
+one write per run), so a run that changes nothing leaves it byte-identical
+and readers never see a partial corpus.
+"""
+
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timezone, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List
+
+from article import Article
+from storage_manager import load_articles, commit_merged
+from metrics import observe
+
+# Path to the checkpoint of an in-progress run
+CHECKPOINT_PATH = os.path.join(os.path.dirname(__file__), '..', '.tmp', 'scrape_checkpoint.json')
+
+# Articles staged by the current run (one JSON line each), merged into storage at the end
+STAGE_PATH = os.path.join(os.path.dirname(__file__), '..', '.tmp', 'scrape_stage.jsonl')
+
+# Number of articles buffered before a durable write
+BATCH_SIZE = 20
+
+# A checkpoint older than this belongs to a stale run and is discarded
+CHECKPOINT_MAX_AGE = timedelta(hours=24)
+
+
+def filter_stage(articles: Iterable[Article], predicate: Callable[[Article], bool]) -> Iterator[Article]:
+    """Yield only the articles accepted by predicate."""
+    for article in articles:
+        if predicate(article):
+            yield article
+
+
+def batch_stage(articles: Iterable[Article], size: int = None) -> Iterator[List[Article]]:
+    """Group a stream of articles into lists of at most `size` items."""
+    size = size or BATCH_SIZE
+    batch = []
+    for article in articles:
+        batch.append(article)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def load_checkpoint() -> Dict:
+    """Load the checkpoint of an interrupted run, or a fresh one."""
+    fresh = {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "completed_sources": [],
+        "seen_ids": [],
+        "staged_ids": []
+    }
+
+    if not os.path.exists(CHECKPOINT_PATH):
+        return fresh
+
+    try:
+        with open(CHECKPOINT_PATH, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+
+        started_at = datetime.fromisoformat(checkpoint['started_at'])
+        if datetime.now(timezone.utc) - started_at > CHECKPOINT_MAX_AGE:
+            print("⚠️  Discarding stale checkpoint")
+            return fresh
+
+        print(f"🔄 Resuming run started at {checkpoint['started_at']} "
+              f"({len(checkpoint['staged_ids'])} articles already staged)")
+        return checkpoint
+
+    except (json.JSONDecodeError, KeyError, ValueError) as e:
+        print(f"⚠️  Ignoring unreadable checkpoint: {e}")
+        return fresh
+
+
+def save_checkpoint(checkpoint: Dict) -> None:
+    """Write the checkpoint atomically."""
+    os.makedirs(os.path.dirname(CHECKPOINT_PATH), exist_ok=True)
+    temp_path = CHECKPOINT_PATH + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+    shutil.move(temp_path, CHECKPOINT_PATH)
+
+
+def clear_checkpoint() -> None:
+    """Remove the checkpoint and staged articles once a run has completed."""
+    for path in (CHECKPOINT_PATH, STAGE_PATH):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def append_stage(articles: List[Article]) -> None:
+    """Durably append a batch to the staging file."""
+    os.makedirs(os.path.dirname(STAGE_PATH), exist_ok=True)
+    with open(STAGE_PATH, 'ab+') as f:
+        if f.tell():
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                f.write(b'\n')  # close a torn line left by an interrupted append
+        for article in articles:
+            f.write(json.dumps(article.to_dict(), ensure_ascii=False).encode('utf-8') + b'\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def iter_stage(ids: set) -> Iterator[Article]:
+    """Staged articles whose ID is in ids (lines of an unfinished append are skipped)."""
+    try:
+        with open(STAGE_PATH, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    article = Article.from_dict(json.loads(line))
+                except (ValueError, KeyError, TypeError):
+                    continue
+                if article.id in ids:
+                    yield article
+    except FileNotFoundError:
+        return
+
+
+class CheckpointedWriter:
+    """
+    Staging sink and final merge.
+    Each committed batch is appended to the staging file and dropped from
+    memory; only its IDs are kept, in the checkpoint, so a restarted run
+    skips what is already staged. finish() reads the staging file once and
+    merges it into storage in one write.
+    """
+
+    def __init__(self, checkpoint: Dict):
+        self.checkpoint = checkpoint
+        self.seen_ids = set(checkpoint['seen_ids'])
+
+        # Articles staged by an interrupted attempt of this run are kept
+        self.staged_ids = set(checkpoint['staged_ids'])
+        if not self.staged_ids and os.path.exists(STAGE_PATH):
+            os.remove(STAGE_PATH)  # left by a discarded run
+        self.total = len(load_articles().get('articles', []))
+        self.commits = 0
+        self.commit_seconds = 0.0
+
+    @property
+    def skip_ids(self) -> set:
+        """IDs that scrapers do not need to fetch again."""
+        return self.seen_ids | self.staged_ids
+
+    def mark_seen(self, articles: Iterable[Article]) -> Iterator[Article]:
+        """Pass-through stage recording every article that reached the pipeline."""
+        for article in articles:
+            self.seen_ids.add(article.id)
+            yield article
+
+    def mark_source_complete(self, name: str) -> None:
+        """
+        Record that a source finished so a restarted run skips it.
+        Persisted with the next commit, once its buffered articles are staged.
+        """
+        self.checkpoint['completed_sources'].append(name)
+
+    def commit(self, batch: List[Article]) -> bool:
+        """Stage a batch durably and advance the checkpoint."""
+        start = time.perf_counter()
+        try:
+            return self._commit(batch)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.commit_seconds += elapsed
+            observe('scraper_stage_duration_seconds', elapsed, stage='commit')
+
+    def _commit(self, batch: List[Article]) -> bool:
+        try:
+            append_stage(batch)
+        except OSError as e:
+            print(f"❌ Could not stage batch: {e}")
+            return False
+        self.staged_ids.update(article.id for article in batch)
+
+        self.commits += 1
+        self.checkpoint['seen_ids'] = sorted(self.seen_ids)
+        self.checkpoint['staged_ids'] = sorted(self.staged_ids)
+        save_checkpoint(self.checkpoint)
+        return True
+
+    def finish(self) -> bool:
+        """Merge the staged articles into storage (one write, retention applied), then drop the checkpoint."""
+        save_checkpoint(self.checkpoint)  # completed sources of the last batch
+        start = time.perf_counter()
+        # Last line wins: a batch re-staged after an interrupted append replaces the earlier copy
+        staged = {article.id: article for article in iter_stage(self.staged_ids)}
+        stored = commit_merged(list(staged.values()))
+        observe('scraper_stage_duration_seconds', time.perf_counter() - start, stage='store')
+        if stored is None:
+            return False
+        self.total = stored['total']
+        clear_checkpoint()
+        return True
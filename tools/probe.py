@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Probe: Synthetic health checks of every scraped endpoint, run concurrently.
+
+Each probe fetches one URL the scrapers depend on and records
+time-to-first-byte, total time and payload size, checks that the content
+still parses (archive links, a dated article page, listing posts) and
+compares the timings with SLOs. Failures do not stop the other probes.
+
+Results are written as a JSON report (.tmp/probe_report.json by default).
+With --record-fixtures the fetched bodies are also saved in the replay
+server's fixture layout (benchmarks/replay_server.py), timestamps replaced
+by the __NOW_ISO__ / __NOW_EPOCH__ placeholders.
+
+Exit status: 0 all healthy, 1 a probe failed, 2 only SLOs were missed.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from bs4 import BeautifulSoup
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(__file__))
+from parsers import parse_archive_links
+import scrape_bensbites
+import scrape_reddit
+import scrape_rundown
+
+# Default location of the JSON report
+PROBE_REPORT_PATH = os.path.join(os.path.dirname(__file__), '..', '.tmp', 'probe_report.json')
+
+# Seconds before a probe request is abandoned
+PROBE_TIMEOUT = 10
+
+# Bytes read per chunk while timing a response
+CHUNK_SIZE = 16 * 1024
+
+# Default SLOs; a --slo-file may override them per source or per probe
+DEFAULT_SLOS = {
+    "ttfb_ms": 2000,
+    "total_ms": 5000,
+    "min_bytes": 1024
+}
+
+# Newsletter scraper modules by source name
+NEWSLETTERS = {
+    'bensbites': scrape_bensbites,
+    'rundown': scrape_rundown,
+}
+
+SOURCES = list(NEWSLETTERS) + ['reddit']
+
+_TIME_RE = re.compile(rb'(<time\b[^>]*\bdatetime=")[^"]*(")')
+_EPOCH_RE = re.compile(rb'("created_utc":\s*)[0-9.]+')
+
+
+def fetch_timed(url: str, headers: Optional[dict]) -> Dict:
+    """GET a URL, timing the first byte and the whole body."""
+    start = time.perf_counter()
+    with requests.get(url, headers=headers, timeout=PROBE_TIMEOUT, stream=True) as response:
+        chunks = response.iter_content(CHUNK_SIZE)
+        first = next(chunks, b'')
+        ttfb = time.perf_counter() - start
+        body = first + b''.join(chunks)
+    total = time.perf_counter() - start
+    return {
+        'status': response.status_code,
+        'ttfb_ms': round(ttfb * 1000, 1),
+        'total_ms': round(total * 1000, 1),
+        'bytes': len(body),
+        'body': body,
+        'ok_status': response.ok
+    }
+
+
+def check_archive(body: bytes, base_url: str) -> int:
+    """Number of article links on an archive page."""
+    return len(parse_archive_links(body, base_url))
+
+
+def check_article(body: bytes, base_url: str) -> int:
+    """1 if the article page still carries the <time datetime> the scraper dates it by."""
+    time_tag = BeautifulSoup(body, 'lxml').find('time')
+    return 1 if time_tag and time_tag.get('datetime') else 0
+
+
+def check_listing(body: bytes, base_url: str) -> int:
+    """Number of posts in a Reddit listing."""
+    return len(json.loads(body).get('data', {}).get('children', []))
+
+
+def run_probe(source: str, name: str, url: str, headers: Optional[dict], check, base_url: str) -> Dict:
+    """Fetch and check one endpoint. Never raises; errors go into the result."""
+    path = url[len(base_url):] if url.startswith(base_url) else urlparse(url).path
+    result = {'source': source, 'name': name, 'url': url, 'path': path.split('?')[0]}
+    try:
+        fetched = fetch_timed(url, headers)
+    except requests.RequestException as e:
+        result.update(ok=False, error=str(e))
+        return result
+
+    body = fetched.pop('body')
+    ok_status = fetched.pop('ok_status')
+    result.update(fetched)
+    if not ok_status:
+        result.update(ok=False, error=f"HTTP {fetched['status']}")
+        return result
+
+    try:
+        result['items'] = check(body, base_url)
+    except (ValueError, AttributeError) as e:
+        result.update(ok=False, error=f"Unparseable response: {e}")
+        return result
+
+    result['ok'] = result['items'] > 0
+    if not result['ok']:
+        result['error'] = "Nothing the scraper could use"
+    result['_body'] = body
+    return result
+
+
+def probe_newsletter(source: str) -> List[Dict]:
+    """Probe a newsletter archive, then the newest article page it links to."""
+    module = NEWSLETTERS[source]
+    archive = run_probe(source, 'archive', f"{module.BASE_URL}/archive", module.HEADERS, check_archive, module.BASE_URL)
+    if not archive['ok']:
+        return [archive]
+
+    article_url, _ = parse_archive_links(archive['_body'], module.BASE_URL)[0]
+    article = run_probe(source, 'article', article_url, module.HEADERS, check_article, module.BASE_URL)
+    return [archive, article]
+
+
+def probe_subreddit(subreddit: str) -> List[Dict]:
+    """Probe the listing the Reddit scraper reads for one subreddit."""
+    url = f"{scrape_reddit.BASE_URL}/r/{subreddit}/top.json?t=day&limit=10"
+    return [run_probe('reddit', f"r/{subreddit}", url, scrape_reddit.HEADERS, check_listing, scrape_reddit.BASE_URL)]
+
+
+def load_slos(path: Optional[str] = None, **overrides) -> Dict:
+    """
+    SLO table: {'default': {...}, '<source>': {...}, '<source> <name>': {...}}.
+    Keyword overrides (e.g. ttfb_ms=800) apply to the defaults.
+    """
+    slos = {'default': dict(DEFAULT_SLOS)}
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            for key, values in json.load(f).items():
+                slos.setdefault(key, {}).update(values)
+    slos['default'].update({k: v for k, v in overrides.items() if v is not None})
+    return slos
+
+
+def slo_for(slos: Dict, result: Dict) -> Dict:
+    """Effective SLO of a probe: defaults < source < source + probe name."""
+    slo = dict(slos['default'])
+    slo.update(slos.get(result['source'], {}))
+    slo.update(slos.get(f"{result['source']} {result['name']}", {}))
+    return slo
+
+
+def evaluate(result: Dict, slo: Dict) -> List[str]:
+    """Descriptions of the SLOs a successful probe missed."""
+    violations = []
+    for field in ('ttfb_ms', 'total_ms'):
+        if slo.get(field) is not None and result[field] > slo[field]:
+            violations.append(f"{field} {result[field]:.0f} > {slo[field]}")
+    if slo.get('min_bytes') is not None and result['bytes'] < slo['min_bytes']:
+        violations.append(f"bytes {result['bytes']} < {slo['min_bytes']}")
+    return violations
+
+
+def templatize(result: Dict) -> bytes:
+    """Body with publish timestamps replaced by the replay server's placeholders."""
+    body = result['_body']
+    if result['name'] == 'article':
+        body = _TIME_RE.sub(rb'\1__NOW_ISO__\2', body)
+    elif result['source'] == 'reddit':
+        body = _EPOCH_RE.sub(rb'\1__NOW_EPOCH__', body)
+    return body
+
+
+def record_fixtures(results: List[Dict], fixtures_dir: str) -> int:
+    """Write healthy probe bodies in the replay fixture layout. Returns files written."""
+    written = 0
+    for result in results:
+        if not result.get('ok'):
+            continue
+        paths = [result['path']]
+        if result['name'] == 'article':
+            # Served for every other /p/<slug> linked from the recorded archive
+            paths.append('/p/_default')
+
+        body = templatize(result)
+        for path in paths:
+            parts = [part for part in path.split('/') if part and part not in ('.', '..')]
+            file_path = os.path.join(fixtures_dir, result['source'], *parts)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, 'wb') as f:
+                f.write(body)
+            written += 1
+    return written
+
+
+def run_probes(sources: List[str] = None, slos: Dict = None, fixtures_dir: str = None) -> Dict:
+    """Run the probes of the given sources concurrently. Returns the report."""
+    sources = sources or SOURCES
+    slos = slos or load_slos()
+    started_at = datetime.now(timezone.utc).isoformat()
+    start = time.perf_counter()
+
+    tasks = [(probe_newsletter, source) for source in sources if source in NEWSLETTERS]
+    if 'reddit' in sources:
+        tasks += [(probe_subreddit, subreddit) for subreddit in scrape_reddit.SUBREDDITS]
+
+    with ThreadPoolExecutor(max_workers=max(len(tasks), 1)) as executor:
+        futures = [executor.submit(func, arg) for func, arg in tasks]
+        results = [result for future in futures for result in future.result()]
+
+    for result in results:
+        result['slo'] = slo_for(slos, result)
+        result['violations'] = evaluate(result, result['slo']) if result['ok'] else []
+
+    recorded = record_fixtures(results, fixtures_dir) if fixtures_dir else 0
+    for result in results:
+        result.pop('_body', None)
+
+    failed = [r for r in results if not r['ok']]
+    slow = [r for r in results if r['violations']]
+    return {
+        'started_at': started_at,
+        'duration_ms': round((time.perf_counter() - start) * 1000, 1),
+        'ok': not failed,
+        'slo_met': not slow,
+        'failed': len(failed),
+        'slo_violations': len(slow),
+        'fixtures_recorded': recorded,
+        'probes': results
+    }
+
+
+def print_report(report: Dict) -> None:
+    for result in report['probes']:
+        label = f"{result['source']} {result['name']}"
+        if not result['ok']:
+            print(f"❌ {label}: {result['error']}")
+            continue
+        timing = f"ttfb {result['ttfb_ms']:.0f}ms, total {result['total_ms']:.0f}ms, {result['bytes']} bytes"
+        if result['violations']:
+            print(f"⚠️  {label}: {timing} - SLO missed: {', '.join(result['violations'])}")
+        else:
+            print(f"✅ {label}: {timing}, {result['items']} items")
+    print(f"⏱️  {len(report['probes'])} probes in {report['duration_ms']:.0f}ms: "
+          f"{report['failed']} failed, {report['slo_violations']} over SLO")
+
+
+def write_report(report: Dict, path: str = None) -> None:
+    path = path or PROBE_REPORT_PATH
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+
+def exit_code(report: Dict) -> int:
+    if not report['ok']:
+        return 1
+    return 0 if report['slo_met'] else 2
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Probe every scraped endpoint and check latency SLOs")
+    parser.add_argument('--sources', help="comma-separated subset of " + ', '.join(SOURCES))
+    parser.add_argument('--report', default=PROBE_REPORT_PATH, help="path of the JSON report")
+    parser.add_argument('--slo-file', help="JSON SLO overrides keyed by 'default', source or 'source name'")
+    parser.add_argument('--ttfb-ms', type=float, help="default time-to-first-byte SLO")
+    parser.add_argument('--total-ms', type=float, help="default total time SLO")
+    parser.add_argument('--min-bytes', type=int, help="default minimum payload size")
+    parser.add_argument('--record-fixtures', metavar='DIR', help="save bodies as replay server fixtures")
+    parser.add_argument('--base-url', help="probe a replay server instead (sources under <base-url>/<source>)")
+    args = parser.parse_args(argv)
+
+    if args.base_url:
+        scrape_bensbites.BASE_URL = f"{args.base_url}/bensbites"
+        scrape_rundown.BASE_URL = f"{args.base_url}/rundown"
+        scrape_reddit.BASE_URL = f"{args.base_url}/reddit"
+
+    sources = args.sources.split(',') if args.sources else None
+    unknown = set(sources or ()) - set(SOURCES)
+    if unknown:
+        parser.error(f"unknown sources: {', '.join(sorted(unknown))}")
+    slos = load_slos(args.slo_file, ttfb_ms=args.ttfb_ms, total_ms=args.total_ms, min_bytes=args.min_bytes)
+    report = run_probes(sources, slos, args.record_fixtures)
+    print_report(report)
+    write_report(report, args.report)
+    print(f"📝 Report written to {args.report}")
+    return exit_code(report)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
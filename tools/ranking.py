@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Ranking: Time-decayed importance score and incrementally maintained top-K feeds.
+
+score = source weight * (1 + ln(1 + upvotes)) * (1 + CLUSTER_BOOST * (cluster size - 1))
+        * 2 ** (-age / HALF_LIFE)
+
+Articles are compared by log(score) + DECAY * published_ts, which differs
+from log(score at time t) only by a term shared by every article. The order
+therefore never changes as time passes, and heaps never need re-scoring:
+only merged-in, removed or re-clustered articles touch them.
+
+A cluster is the set of articles whose titles share the same signature (the
+most specific words), i.e. the same story covered by several sources.
+"""
+
+import heapq
+import math
+import re
+import time
+from typing import Dict, Iterable, List, Tuple
+
+from article import Article
+
+# Relative importance of each source (unknown sources get DEFAULT_SOURCE_WEIGHT)
+SOURCE_WEIGHTS = {
+    "Ben's Bites": 1.0,
+    "The AI Rundown": 1.0,
+    "Reddit": 0.8,
+}
+DEFAULT_SOURCE_WEIGHT = 1.0
+
+# Score halves every HALF_LIFE_HOURS
+HALF_LIFE_HOURS = 12
+DECAY = math.log(2) / (HALF_LIFE_HOURS * 3600)
+
+# Largest exponent score_at passes to math.exp (overflow starts above ~709.78)
+MAX_EXPONENT = 700
+
+# Extra weight per additional article covering the same story
+CLUSTER_BOOST = 0.5
+
+# Size of each maintained feed
+TOP_K = 100
+
+# Number of title words that make up a cluster signature
+SIGNATURE_WORDS = 3
+
+# Feed containing every article; the other feeds are one per source
+ALL = 'all'
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9'+.-]*")
+
+_STOPWORDS = frozenset((
+    'about', 'after', 'again', 'also', 'before', 'being', 'from', 'have', 'here', 'into',
+    'just', 'more', 'most', 'much', 'only', 'over', 'some', 'than', 'that', 'their',
+    'them', 'then', 'there', 'these', 'they', 'this', 'what', 'when', 'where', 'which',
+    'while', 'will', 'with', 'your', 'does', 'make', 'makes', 'know', 'like', 'today',
+    'news', 'week', 'weekly', 'daily', 'update', 'updates'
+))
+
+
+def title_signature(title: str) -> str:
+    """Cluster key: the longest few non-stopword words of a title, sorted."""
+    words = {word.strip("'.-") for word in _WORD_RE.findall((title or '').lower())}
+    words = [word for word in words if len(word) > 3 and word not in _STOPWORDS]
+    if not words:
+        return ''
+    words.sort(key=lambda word: (-len(word), word))
+    return ' '.join(sorted(words[:SIGNATURE_WORDS]))
+
+
+def base_score(article: Article, cluster_size: int = 1) -> float:
+    """Score before time decay."""
+    weight = SOURCE_WEIGHTS.get(article.source, DEFAULT_SOURCE_WEIGHT)
+    upvotes = article.get('upvotes') or 0
+    popularity = 1 + math.log1p(max(upvotes, 0)) if isinstance(upvotes, (int, float)) else 1
+    return weight * popularity * (1 + CLUSTER_BOOST * (max(cluster_size, 1) - 1))
+
+
+def rank_key(article: Article, cluster_size: int = 1) -> float:
+    """
+    Time-invariant sort key (higher ranks first); undated articles sort last.
+    Future-dated articles (a bad <time datetime>) rank as if published when keyed.
+    """
+    if article.published_ts is None:
+        return float('-inf')
+    published_ts = min(article.published_ts, time.time())
+    return math.log(base_score(article, cluster_size)) + DECAY * published_ts
+
+
+def score_at(key: float, now: float = None) -> float:
+    """Decayed score of a rank key at time `now` (epoch seconds)."""
+    if key == float('-inf'):
+        return 0.0
+    # Capped below math.exp's overflow, for a `now` earlier than the key was computed
+    return math.exp(min(key - DECAY * (time.time() if now is None else now), MAX_EXPONENT))
+
+
+class RankIndex:
+    """
+    Top-K feeds ('all' and one per source) kept as bounded min-heaps.
+    sync() applies the difference between the indexed articles and a new
+    corpus; unchanged articles are not touched.
+    """
+
+    def __init__(self, k: int = TOP_K):
+        self.k = k
+        self.articles = {}      # id -> Article
+        self.keys = {}          # id -> rank key
+        self.signatures = {}    # id -> cluster signature
+        self.clusters = {}      # signature -> set of ids
+        self.members = {}       # feed -> set of ids
+        self.heaps = {}         # feed -> min-heap of (key, id), at most k entries
+        self.in_heap = {}       # feed -> set of ids currently in its heap
+        self.dirty = set()      # feeds whose heap must be rebuilt before reading
+        self._sorted = {}       # feed -> cached descending [(key, id)]
+
+    @staticmethod
+    def _inputs(article: Article) -> Tuple:
+        return (article.source, article.title, article.published_ts, article.get('upvotes'))
+
+    @staticmethod
+    def _feeds(article: Article) -> Tuple[str, str]:
+        return (ALL, article.source)
+
+    def sync(self, articles: Iterable[Article]) -> Dict[str, int]:
+        """Bring the index in line with `articles`. Returns added/removed/changed counts."""
+        incoming = {article.id: article for article in articles}
+        removed = [article_id for article_id in self.articles if article_id not in incoming]
+        changed = []
+        added = []
+        for article_id, article in incoming.items():
+            current = self.articles.get(article_id)
+            if current is None:
+                added.append(article)
+            elif current is not article and self._inputs(current) != self._inputs(article):
+                changed.append(article)
+
+        if len(added) + len(changed) > len(self.articles) // 2:
+            # Mostly new content: rebuilding the heaps once is cheaper than offering each article
+            self.dirty.update(self.members)
+            self.dirty.update(feed for article in added for feed in self._feeds(article))
+
+        touched = set()
+        loose = []
+        for article_id in removed:
+            touched.add(self._remove(article_id))
+        for article in changed:
+            touched.add(self._remove(article.id))
+        for article in added + changed:
+            signature = self._add(article)
+            if signature:
+                touched.add(signature)
+            else:
+                loose.append(article.id)
+        for article_id, article in incoming.items():
+            # Same content, new object (corpus reloaded): keep the index entry
+            self.articles[article_id] = article
+
+        touched.discard('')
+        for signature in touched:
+            cluster = self.clusters.get(signature, ())
+            for article_id in cluster:
+                self._place(article_id, len(cluster))
+        for article_id in loose:
+            self._place(article_id, 1)
+        return {'added': len(added), 'removed': len(removed), 'changed': len(changed)}
+
+    def _add(self, article: Article) -> str:
+        signature = title_signature(article.title)
+        self.articles[article.id] = article
+        self.signatures[article.id] = signature
+        if signature:
+            self.clusters.setdefault(signature, set()).add(article.id)
+        for feed in self._feeds(article):
+            self.members.setdefault(feed, set()).add(article.id)
+        return signature
+
+    def _remove(self, article_id: str) -> str:
+        article = self.articles.pop(article_id)
+        signature = self.signatures.pop(article_id)
+        self.keys.pop(article_id, None)
+        if signature:
+            cluster = self.clusters[signature]
+            cluster.discard(article_id)
+            if not cluster:
+                del self.clusters[signature]
+        for feed in self._feeds(article):
+            members = self.members[feed]
+            members.discard(article_id)
+            if not members:
+                del self.members[feed]
+            if article_id in self.in_heap.get(feed, ()):
+                # A slot in the top-K opened up: the next best is outside the heap
+                self.dirty.add(feed)
+        return signature
+
+    def _place(self, article_id: str, cluster_size: int) -> None:
+        """(Re)compute an article's key and offer it to its feeds' heaps."""
+        article = self.articles[article_id]
+        key = rank_key(article, cluster_size)
+        previous = self.keys.get(article_id)
+        if previous == key:
+            return
+        self.keys[article_id] = key
+
+        for feed in self._feeds(article):
+            if feed in self.dirty:
+                continue
+            heap = self.heaps.setdefault(feed, [])
+            in_heap = self.in_heap.setdefault(feed, set())
+            self._sorted.pop(feed, None)
+            if article_id in in_heap:
+                if key < previous and len(heap) >= self.k:
+                    # Demoted: something outside the heap may now rank higher
+                    self.dirty.add(feed)
+                else:
+                    index = next(i for i, entry in enumerate(heap) if entry[1] == article_id)
+                    heap[index] = (key, article_id)
+                    heapq.heapify(heap)
+            elif len(heap) < self.k:
+                heapq.heappush(heap, (key, article_id))
+                in_heap.add(article_id)
+            elif (key, article_id) > heap[0]:
+                evicted = heapq.heapreplace(heap, (key, article_id))
+                in_heap.discard(evicted[1])
+                in_heap.add(article_id)
+
+    def _rebuild(self, feed: str) -> None:
+        heap = heapq.nlargest(self.k, ((self.keys[i], i) for i in self.members.get(feed, ())))
+        heapq.heapify(heap)
+        self.heaps[feed] = heap
+        self.in_heap[feed] = {article_id for _, article_id in heap}
+        self.dirty.discard(feed)
+        self._sorted.pop(feed, None)
+
+    def feeds(self) -> List[str]:
+        """Names of the maintained feeds."""
+        return sorted(self.members)
+
+    def top(self, feed: str = ALL, limit: int = None) -> List[Tuple[float, Article]]:
+        """Best articles of a feed as (key, Article), highest first."""
+        if feed in self.dirty:
+            self._rebuild(feed)
+        ranked = self._sorted.get(feed)
+        if ranked is None:
+            ranked = sorted(self.heaps.get(feed, ()), reverse=True)
+            self._sorted[feed] = ranked
+        limit = self.k if limit is None else min(limit, self.k)
+        return [(key, self.articles[article_id]) for key, article_id in ranked[:limit]]
+
+    def top_of(self, ids: Iterable[str], limit: int = None) -> List[Tuple[float, Article]]:
+        """Best articles among an arbitrary ID set (e.g. a user's saved articles)."""
+        entries = ((self.keys[i], i) for i in ids if i in self.keys)
+        limit = self.k if limit is None else limit
+        return [(key, self.articles[article_id]) for key, article_id in heapq.nlargest(limit, entries)]
+
+    def cluster_size(self, article_id: str) -> int:
+        """Number of indexed articles sharing this article's title signature."""
+        signature = self.signatures.get(article_id)
+        return len(self.clusters.get(signature, ())) if signature else 1
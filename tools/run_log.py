@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Run Log: Bounded, rotating JSON Lines log of scraper runs.
+Replaces appending Markdown to progress.md. The active file holds at most
+MAX_ENTRIES runs; older files are kept as runs.jsonl.1 ... runs.jsonl.N.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from typing import Dict, List
+
+RUN_LOG_PATH = os.path.join(os.path.dirname(__file__), '..', 'logs', 'runs.jsonl')
+
+# Runs per file before rotating
+MAX_ENTRIES = 200
+
+# Rotated files to keep (runs.jsonl.1 is the newest)
+KEEP_ROTATIONS = 2
+
+
+def _count_entries(path: str) -> int:
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'rb') as f:
+        return sum(1 for _ in f)
+
+
+def rotate() -> None:
+    """Shift runs.jsonl -> .1 -> .2 ..., dropping the oldest."""
+    oldest = f"{RUN_LOG_PATH}.{KEEP_ROTATIONS}"
+    if os.path.exists(oldest):
+        os.remove(oldest)
+    for index in range(KEEP_ROTATIONS - 1, 0, -1):
+        src = f"{RUN_LOG_PATH}.{index}"
+        if os.path.exists(src):
+            os.replace(src, f"{RUN_LOG_PATH}.{index + 1}")
+    if KEEP_ROTATIONS > 0:
+        os.replace(RUN_LOG_PATH, f"{RUN_LOG_PATH}.1")
+    else:
+        os.remove(RUN_LOG_PATH)
+
+
+def append_run(entry: Dict) -> None:
+    """Append one run record, rotating first if the active file is full."""
+    os.makedirs(os.path.dirname(RUN_LOG_PATH), exist_ok=True)
+    if _count_entries(RUN_LOG_PATH) >= MAX_ENTRIES:
+        rotate()
+
+    record = {"timestamp": datetime.now(timezone.utc).isoformat(), **entry}
+    with open(RUN_LOG_PATH, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, sort_keys=True, ensure_ascii=False) + '\n')
+
+
+def read_runs(limit: int = 20) -> List[Dict]:
+    """Return the most recent runs from the active file, newest last."""
+    if not os.path.exists(RUN_LOG_PATH):
+        return []
+    with open(RUN_LOG_PATH, 'r', encoding='utf-8') as f:
+        lines = f.readlines()[-limit:]
+    return [json.loads(line) for line in lines if line.strip()]
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Saved Store: Per-user saved article IDs, kept apart from the article corpus.
+Each user has one small file, saved/<user>.json, holding a sorted list of
+article IDs and a version counter. Toggling a save rewrites only that file;
+articles.json is never touched, so the corpus stays immutable between
+scraper runs and its caches stay valid.
+"""
+
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, FrozenSet, Iterable, List
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, single writer assumed
+    fcntl = None
+
+from snapshots import fsync_dir
+
+# Directory holding one saved-ID file per user
+SAVED_DIR = os.path.join(os.path.dirname(__file__), '..', 'saved')
+
+# User of the single-user dashboard (and of flags migrated from articles.json)
+DEFAULT_USER = 'default'
+
+USER_RE = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+_thread_lock = threading.Lock()
+
+# path -> ((mtime_ns, size), {'ids': frozenset, 'version': int})
+_cache = {}
+
+
+def user_path(user: str) -> str:
+    """Path of a user's saved file; raises ValueError for unsafe user names."""
+    if not USER_RE.match(user or ''):
+        raise ValueError(f"Invalid user name: {user!r}")
+    return os.path.join(SAVED_DIR, f"{user}.json")
+
+
+def list_users() -> List[str]:
+    """Users that have a saved file."""
+    try:
+        names = os.listdir(SAVED_DIR)
+    except FileNotFoundError:
+        return []
+    return sorted(name[:-5] for name in names if name.endswith('.json') and USER_RE.match(name[:-5]))
+
+
+def load_saved(user: str = DEFAULT_USER) -> Dict:
+    """{'ids': frozenset, 'version': int} for a user, re-read only when the file changed."""
+    path = user_path(user)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return {'ids': frozenset(), 'version': 0}
+
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _cache.get(path)
+    if cached and cached[0] == key:
+        return cached[1]
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        saved = {'ids': frozenset(data.get('ids', [])), 'version': data.get('version', 0)}
+    except (OSError, json.JSONDecodeError, AttributeError) as e:
+        print(f"❌ Could not read saved articles for {user}: {e}")
+        return {'ids': frozenset(), 'version': 0}
+
+    _cache[path] = (key, saved)
+    return saved
+
+
+def saved_ids(user: str = DEFAULT_USER) -> FrozenSet[str]:
+    """IDs saved by one user."""
+    return load_saved(user)['ids']
+
+
+def all_saved_ids() -> FrozenSet[str]:
+    """IDs saved by any user (what retention must keep)."""
+    ids = set()
+    for user in list_users():
+        ids |= load_saved(user)['ids']
+    return frozenset(ids)
+
+
+@contextmanager
+def _user_lock(path: str):
+    """Advisory lock around a read-modify-write of one user's file."""
+    with _thread_lock:
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + '.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _write(path: str, ids: Iterable[str], version: int) -> None:
+    """Atomic, fsynced write of a sorted ID list."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = {
+        "ids": sorted(ids),
+        "updated_at": datetime.utcnow().isoformat() + "Z",
+        "version": version
+    }
+    temp_path = path + '.tmp'
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+            f.write('\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        fsync_dir(path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def update_saved(user: str, add: Iterable[str] = (), remove: Iterable[str] = ()) -> int:
+    """
+    Add and remove IDs in one locked write.
+    Returns the user's saved version (unchanged, and no write, if nothing changed).
+    """
+    path = user_path(user)
+    with _user_lock(path):
+        current = load_saved(user)
+        ids = (current['ids'] | frozenset(add)) - frozenset(remove)
+        if ids == current['ids']:
+            return current['version']
+
+        version = current['version'] + 1
+        _write(path, ids, version)
+        stat = os.stat(path)
+        _cache[path] = ((stat.st_mtime_ns, stat.st_size), {'ids': ids, 'version': version})
+        return version
+
+
+def set_saved(article_id: str, saved: bool, user: str = DEFAULT_USER) -> int:
+    """Save or unsave one article for a user. Returns the new saved version."""
+    if saved:
+        return update_saved(user, add=[article_id])
+    return update_saved(user, remove=[article_id])
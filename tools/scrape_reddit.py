@@ -12,76 +12,107 @@ import os
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(__file__))
 from storage_manager import generate_article_id
+from article import Article
+from metrics import observe_http
 
+BASE_URL = "https://reddit.com"
 
-def scrape_reddit() -> list:
+# Pause between subreddit requests
+RATE_LIMIT_SECONDS = 1
+
+SUBREDDITS = ['artificial', 'MachineLearning', 'Singularity']
+HEADERS = {'User-Agent': 'AI-News-Dashboard/1.0'}
+
+
+def fetch_listing(url: str) -> list:
+    """Fetch a subreddit listing (JSON), returning its posts."""
+    start = time.perf_counter()
+    try:
+        response = requests.get(url, headers=HEADERS, timeout=10)
+    except requests.RequestException:
+        observe_http(url, time.perf_counter() - start, 0, 'error')
+        raise
+    observe_http(url, time.perf_counter() - start, len(response.content), response.status_code)
+    response.raise_for_status()
+    
+    data = response.json()
+    return data.get('data', {}).get('children', [])
+
+
+def build_article(post: dict, subreddit: str) -> Article:
+    """Article for one post of a listing."""
+    # Extract data
+    title = post.get('title', '')
+    post_url = post.get('url', '')
+    upvotes = post.get('ups', 0)
+    author = post.get('author', 'Unknown')
+    created_utc = post.get('created_utc', time.time())
+    
+    # Convert timestamp to ISO format
+    published_at = datetime.fromtimestamp(created_utc, tz=timezone.utc).isoformat()
+    
+    # Use selftext as summary if available, otherwise empty
+    summary = post.get('selftext', '')[:200]
+    if len(post.get('selftext', '')) > 200:
+        summary += "..."
+    
+    return Article(
+        id=generate_article_id(post_url),
+        title=title,
+        source='Reddit',
+        url=post_url,
+        summary=summary,
+        published_at=published_at,
+        category=f'r/{subreddit}',
+        metadata={
+            'author': author,
+            'upvotes': upvotes,
+            'subreddit': subreddit
+        }
+    )
+
+
+def iter_reddit(skip_ids: set = None):
     """
-    Scrape top posts from AI-related subreddits.
-    Returns list of Article objects.
+    Scrape top posts from AI-related subreddits, yielding Article objects
+    as they are produced. Posts whose ID is in skip_ids are skipped.
     """
-    subreddits = ['artificial', 'MachineLearning', 'Singularity']
-    headers = {'User-Agent': 'AI-News-Dashboard/1.0'}
-    articles = []
+    skip_ids = skip_ids or set()
+    count = 0
     
-    for subreddit in subreddits:
-        url = f"https://reddit.com/r/{subreddit}/top.json?t=day&limit=10"
+    for subreddit in SUBREDDITS:
+        url = f"{BASE_URL}/r/{subreddit}/top.json?t=day&limit=10"
         
         try:
             print(f"🔍 Fetching r/{subreddit}...")
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            posts = data.get('data', {}).get('children', [])
+            posts = fetch_listing(url)
             
             print(f"📰 Found {len(posts)} posts from r/{subreddit}")
             
             for post_data in posts:
-                post = post_data.get('data', {})
-                
-                # Extract data
-                title = post.get('title', '')
-                post_url = post.get('url', '')
-                upvotes = post.get('ups', 0)
-                author = post.get('author', 'Unknown')
-                created_utc = post.get('created_utc', time.time())
-                
-                # Convert timestamp to ISO format
-                published_at = datetime.fromtimestamp(created_utc, tz=timezone.utc).isoformat()
+                article = build_article(post_data.get('data', {}), subreddit)
+                if article.id in skip_ids:
+                    continue
                 
-                # Use selftext as summary if available, otherwise empty
-                summary = post.get('selftext', '')[:200]
-                if len(post.get('selftext', '')) > 200:
-                    summary += "..."
-                
-                # Create article object
-                article = {
-                    'id': generate_article_id(post_url),
-                    'title': title,
-                    'source': 'Reddit',
-                    'url': post_url,
-                    'summary': summary,
-                    'published_at': published_at,
-                    'category': f'r/{subreddit}',
-                    'saved': False,
-                    'metadata': {
-                        'author': author,
-                        'upvotes': upvotes,
-                        'subreddit': subreddit
-                    }
-                }
-                
-                articles.append(article)
+                count += 1
+                yield article
             
             # Rate limiting between subreddits
-            time.sleep(1)
+            time.sleep(RATE_LIMIT_SECONDS)
             
         except Exception as e:
             print(f"❌ Error scraping r/{subreddit}: {e}")
             continue
     
-    print(f"✅ Scraped {len(articles)} total posts from Reddit")
-    return articles
+    print(f"✅ Scraped {count} total posts from Reddit")
+
+
+def scrape_reddit() -> list:
+    """
+    Scrape top posts from AI-related subreddits.
+    Returns list of Article objects.
+    """
+    return list(iter_reddit())
 
 
 if __name__ == "__main__":
@@ -90,7 +121,7 @@ if __name__ == "__main__":
     
     if articles:
         print("\nSample article:")
-        print(f"  Title: {articles[0]['title']}")
-        print(f"  URL: {articles[0]['url']}")
-        print(f"  Upvotes: {articles[0]['metadata']['upvotes']}")
-        print(f"  Published: {articles[0]['published_at']}")
+        print(f"  Title: {articles[0].title}")
+        print(f"  URL: {articles[0].url}")
+        print(f"  Upvotes: {articles[0].upvotes}")
+        print(f"  Published: {articles[0].published_at}")
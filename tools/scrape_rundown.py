@@ -4,8 +4,6 @@ The AI Rundown Scraper: Extracts articles from therundown.ai/archive
 """
 
 import requests
-from bs4 import BeautifulSoup
-from datetime import datetime, timezone
 import time
 import sys
 import os
@@ -13,64 +11,117 @@ import os
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(__file__))
 from storage_manager import generate_article_id
+from article import Article
+from parsers import parse_archive_links, parse_article_page
+from parse_pool import run_parse, parse_stream
+from metrics import observe_http
+import content_store
+
+BASE_URL = "https://therundown.ai"
+DEFAULT_AUTHOR = "Zach Mink"
+
+# Pause between article page fetches, and before retrying a failed request
+RATE_LIMIT_SECONDS = 1
+RETRY_BACKOFF_SECONDS = 5
+
+HEADERS = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'}
+
+# Author is always DEFAULT_AUTHOR (pages carry no usable byline)
+DETECT_AUTHOR = False
 
 
 def fetch_with_retry(url: str, headers: dict = None, retries: int = 1) -> requests.Response:
     """Fetch URL with retry logic."""
     for attempt in range(retries + 1):
+        start = time.perf_counter()
         try:
             response = requests.get(url, headers=headers, timeout=10)
+            observe_http(url, time.perf_counter() - start, len(response.content), response.status_code)
             response.raise_for_status()
             return response
         except requests.RequestException as e:
+            if e.response is None:
+                observe_http(url, time.perf_counter() - start, 0, 'error')
             if attempt < retries:
                 print(f"⚠️  Retry {attempt + 1}/{retries} for {url}")
-                time.sleep(5)
+                time.sleep(RETRY_BACKOFF_SECONDS)
             else:
                 raise e
 
 
-def extract_article_metadata(article_url: str, headers: dict) -> dict:
+def fetch_article_content(article_url: str, headers: dict = None):
+    """Fetch an article page, returning raw bytes or None on failure."""
+    try:
+        return fetch_with_retry(article_url, headers=headers).content
+    except Exception as e:
+        print(f"⚠️  Could not fetch metadata for {article_url}: {e}")
+        return None
+
+
+def fetch_article_pages(links: list, skip_ids: set, headers: dict):
     """
-    Fetch individual article page to extract metadata.
-    Returns dict with published_at and summary.
+    Network stage: fetch article pages and emit parse jobs for the parse pool.
+    Yields ((article_url, title), parse_func, args) tuples.
     """
-    try:
-        response = fetch_with_retry(article_url, headers=headers)
-        soup = BeautifulSoup(response.content, 'lxml')
-        
-        # Try to find published date
-        time_tag = soup.find('time')
-        if time_tag and time_tag.get('datetime'):
-            published_at = time_tag['datetime']
-        else:
-            published_at = datetime.now(timezone.utc).isoformat()
-        
-        # Try to find summary/description
-        meta_desc = soup.find('meta', {'property': 'og:description'}) or \
-                    soup.find('meta', {'name': 'description'})
-        summary = meta_desc['content'] if meta_desc else ""
+    for i, (article_url, title) in enumerate(links):
+        if generate_article_id(article_url) in skip_ids:
+            print(f"  [{i+1}/{len(links)}] ⏭️  Already stored: {title[:50]}")
+            continue
         
-        # Truncate summary
-        if len(summary) > 200:
-            summary = summary[:197] + "..."
+        print(f"  [{i+1}/{len(links)}] {title[:50]}...")
         
-        # Author
-        author = "Zach Mink"  # Default for The AI Rundown
+        content = fetch_article_content(article_url, headers)
+        yield (article_url, title), parse_article_page, (content, DEFAULT_AUTHOR, DETECT_AUTHOR, content_store.EXTRACT_TEXT)
         
-        return {
-            'published_at': published_at,
-            'summary': summary,
-            'author': author
+        # Rate limiting
+        time.sleep(RATE_LIMIT_SECONDS)
+
+
+def build_article(article_url: str, title: str, metadata: dict) -> Article:
+    """Article from an archive link and its parsed page metadata."""
+    return Article(
+        id=generate_article_id(article_url),
+        title=title,
+        source='The AI Rundown',
+        url=article_url,
+        summary=metadata['summary'],
+        published_at=metadata['published_at'],
+        category='AI News',
+        metadata={
+            'author': metadata['author'],
+            'newsletter_issue': ''
         }
+    )
+
+
+def iter_rundown(skip_ids: set = None):
+    """
+    Scrape The AI Rundown archive, yielding Article objects as they are produced.
+    Articles whose ID is in skip_ids are not fetched again (checkpoint resume).
+    """
+    archive_url = f"{BASE_URL}/archive"
+    headers = HEADERS
+    skip_ids = skip_ids or set()
+    count = 0
+    
+    print("🔍 Fetching The AI Rundown archive...")
+    response = fetch_with_retry(archive_url, headers=headers)
+    
+    # Find all unique article links (they use /p/ pattern)
+    unique_links = run_parse(parse_archive_links, response.content, BASE_URL)
+    
+    print(f"📰 Found {len(unique_links)} unique articles (limit: 10)")
+    
+    # fetch (this thread) -> parse (process pool) -> normalize (below)
+    jobs = fetch_article_pages(unique_links[:10], skip_ids, headers)
+    for (article_url, title), metadata in parse_stream(jobs):
+        article = build_article(article_url, title, metadata)
+        content_store.store(article.id, metadata.get('text'))
         
-    except Exception as e:
-        print(f"⚠️  Could not fetch metadata for {article_url}: {e}")
-        return {
-            'published_at': datetime.now(timezone.utc).isoformat(),
-            'summary': "",
-            'author': 'Zach Mink'
-        }
+        count += 1
+        yield article
+    
+    print(f"✅ Scraped {count} articles from The AI Rundown")
 
 
 def scrape_rundown() -> list:
@@ -78,74 +129,13 @@ def scrape_rundown() -> list:
     Scrape The AI Rundown archive.
     Returns list of Article objects.
     """
-    archive_url = "https://therundown.ai/archive"
-    headers = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'}
     articles = []
-    
     try:
-        print("🔍 Fetching The AI Rundown archive...")
-        response = fetch_with_retry(archive_url, headers=headers)
-        soup = BeautifulSoup(response.content, 'lxml')
-        
-        # Find all article links
-        article_links = soup.find_all('a', href=lambda x: x and '/p/' in x)
-        
-        print(f"📰 Found {len(article_links)} potential articles")
-        
-        # Deduplicate by href
-        seen_urls = set()
-        unique_links = []
-        for link in article_links:
-            href = link.get('href')
-            if href not in seen_urls:
-                seen_urls.add(href)
-                unique_links.append(link)
-        
-        print(f"📰 Processing {len(unique_links)} unique articles (limit: 10)")
-        
-        # Process first 10 articles
-        for i, link in enumerate(unique_links[:10]):
-            href = link.get('href')
-            title = link.get_text(strip=True)
-            
-            # Make absolute URL
-            if href.startswith('/'):
-                article_url = f"https://therundown.ai{href}"
-            else:
-                article_url = href
-            
-            print(f"  [{i+1}/10] {title[:50]}...")
-            
-            # Fetch metadata
-            metadata = extract_article_metadata(article_url, headers)
-            
-            # Create article object
-            article = {
-                'id': generate_article_id(article_url),
-                'title': title,
-                'source': 'The AI Rundown',
-                'url': article_url,
-                'summary': metadata['summary'],
-                'published_at': metadata['published_at'],
-                'category': 'AI News',
-                'saved': False,
-                'metadata': {
-                    'author': metadata['author'],
-                    'newsletter_issue': ''
-                }
-            }
-            
+        for article in iter_rundown():
             articles.append(article)
-            
-            # Rate limiting
-            time.sleep(1)
-        
-        print(f"✅ Scraped {len(articles)} articles from The AI Rundown")
-        return articles
-        
     except Exception as e:
         print(f"❌ Error scraping The AI Rundown: {e}")
-        return []
+    return articles
 
 
 if __name__ == "__main__":
@@ -154,6 +144,6 @@ if __name__ == "__main__":
     
     if articles:
         print("\nSample article:")
-        print(f"  Title: {articles[0]['title']}")
-        print(f"  URL: {articles[0]['url']}")
-        print(f"  Published: {articles[0]['published_at']}")
+        print(f"  Title: {articles[0].title}")
+        print(f"  URL: {articles[0].url}")
+        print(f"  Published: {articles[0].published_at}")
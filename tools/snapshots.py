@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Snapshots: Numbered generations of a storage file, rotated without copying.
+Before a new version replaces `path`, the current file is hardlinked to
+`path.1` (older generations shift to `.2`, `.3`, ...), so keeping history
+costs a directory entry rather than a second copy of the corpus.
+Writes are fsynced (file and directory) before they are considered durable.
+"""
+
+import os
+import shutil
+from typing import Callable, List
+
+# Number of previous generations kept next to the live file
+KEEP_GENERATIONS = 3
+
+
+def generation_path(path: str, generation: int) -> str:
+    """Path of generation N (0 is the live file)."""
+    return path if generation == 0 else f"{path}.{generation}"
+
+
+def candidates(path: str) -> List[str]:
+    """Live file followed by generations, newest first."""
+    return [generation_path(path, generation) for generation in range(KEEP_GENERATIONS + 1)]
+
+
+def fsync_dir(path: str) -> None:
+    """Flush the directory entry changes (renames, links) for path."""
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def rotate(path: str) -> None:
+    """Shift generations up by one and link the live file in as generation 1."""
+    if not os.path.exists(path) or KEEP_GENERATIONS <= 0:
+        return
+
+    oldest = generation_path(path, KEEP_GENERATIONS)
+    if os.path.exists(oldest):
+        os.remove(oldest)
+    for generation in range(KEEP_GENERATIONS - 1, 0, -1):
+        src = generation_path(path, generation)
+        if os.path.exists(src):
+            os.replace(src, generation_path(path, generation + 1))
+
+    try:
+        os.link(path, generation_path(path, 1))
+    except OSError:
+        # Filesystems without hardlinks fall back to a copy
+        shutil.copy2(path, generation_path(path, 1))
+
+
+def write_durably(path: str, write: Callable) -> None:
+    """
+    Rotate generations, then write a new live file via write(file_obj).
+    The temp file is fsynced before the atomic rename and the directory after.
+    """
+    temp_path = path + '.tmp'
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+
+        rotate(path)
+        os.replace(temp_path, path)
+        fsync_dir(path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def restore(path: str, generation: int) -> None:
+    """Make generation N the live file again (by link, not copy)."""
+    source = generation_path(path, generation)
+    temp_path = path + '.restore'
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    try:
+        os.link(source, temp_path)
+    except OSError:
+        shutil.copy2(source, temp_path)
+    os.replace(temp_path, path)
+    fsync_dir(path)
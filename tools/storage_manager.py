@@ -2,18 +2,50 @@
 """
 Storage Manager: Handles all read/write operations for articles.json
 Implements atomic writes and schema validation.
+Articles are serialized canonically with a content hash, so saving an
+unchanged article set is a no-op.
+
+In memory, articles are Article objects (article.py); they are converted to
+schema dicts only for hashing and JSON encoding.
+
+Saved state is per user and lives in saved_store.py; the corpus only changes
+when the scrapers change it. Files written before that still carry `saved`
+flags; migrate_saved_flags() moves them to the default user's saved set
+(run explicitly by the scraper manager, never on a read).
+
+Concurrency: writers hold an advisory lock on articles.json.lock while
+committing. Every write bumps a `version` counter; a writer that loaded an
+older version is merged with the stored articles instead of overwriting them.
 """
 
 import json
 import os
-import shutil
+import re
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from typing import List, Dict, Optional
 import hashlib
 
-# Path to storage file
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, single writer assumed
+    fcntl = None
+
+from article import Article, from_dicts, to_dicts
+from metrics import timed
+import saved_store
+import snapshots
+
+# Path to storage file (previous generations live at articles.json.1, .2, ...)
 STORAGE_PATH = os.path.join(os.path.dirname(__file__), '..', 'articles.json')
-BACKUP_PATH = STORAGE_PATH + '.backup'
+
+# Process-local state of the advisory lock, so nested storage_lock() calls are safe
+_thread_lock = threading.RLock()
+_lock_state = {'depth': 0, 'file': None}
+
+# Header fields are written at the end of the file (keys are sorted)
+_HEADER_RE = re.compile(rb'"(content_hash|last_updated)": "([^"]*)"|"(version)": (\d+)')
 
 
 def generate_article_id(url: str) -> str:
@@ -21,127 +53,284 @@ def generate_article_id(url: str) -> str:
     return hashlib.md5(url.encode()).hexdigest()[:16]
 
 
-def validate_article(article: Dict) -> bool:
-    """Validate article against schema."""
-    required_fields = ['id', 'title', 'source', 'url', 'published_at', 'saved']
-    
-    for field in required_fields:
-        if field not in article:
-            print(f"⚠️  Missing required field: {field}")
-            return False
+def validate_article(article) -> bool:
+    """Validate a single article (Article or schema dict) against schema."""
+    _, errors = from_dicts([article])
+    for error in errors:
+        print(f"⚠️  {error}")
+    return not errors
+
+
+def canonical_order(articles: List[Article]) -> List[Article]:
+    """
+    Deterministic article order: newest first by parsed timestamp (so ISO
+    strings of different formats compare correctly), undated articles last,
+    ties broken by ID.
+    """
+    return sorted(articles, key=lambda a: (a.published_ts is None, -(a.published_ts or 0), a.id))
+
+
+def compute_content_hash(articles: List[Dict]) -> str:
+    """SHA-256 of the canonical (sorted keys, compact) encoding of articles."""
+    encoded = json.dumps(articles, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def read_header() -> Dict:
+    """Read content_hash, last_updated and version without parsing the whole file."""
+    try:
+        with open(STORAGE_PATH, 'rb') as f:
+            f.seek(max(os.path.getsize(STORAGE_PATH) - 512, 0))
+            tail = f.read()
+    except OSError:
+        return {}
     
-    return True
+    header = {}
+    for match in _HEADER_RE.finditer(tail):
+        if match.group(3):
+            header['version'] = int(match.group(4))
+        else:
+            header[match.group(1).decode()] = match.group(2).decode()
+    return header
+
+
+def read_content_hash() -> Optional[str]:
+    """Read the stored content hash without parsing the whole file."""
+    return read_header().get('content_hash')
+
+
+def read_version() -> int:
+    """Read the stored version counter (0 for a new or pre-versioning file)."""
+    return read_header().get('version', 0)
+
+
+@contextmanager
+def storage_lock():
+    """Hold the cross-process advisory write lock on articles.json (reentrant)."""
+    with _thread_lock:
+        if _lock_state['depth'] == 0 and fcntl is not None:
+            lock_file = open(STORAGE_PATH + '.lock', 'a')
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            _lock_state['file'] = lock_file
+        _lock_state['depth'] += 1
+        try:
+            yield
+        finally:
+            _lock_state['depth'] -= 1
+            if _lock_state['depth'] == 0 and _lock_state['file'] is not None:
+                fcntl.flock(_lock_state['file'], fcntl.LOCK_UN)
+                _lock_state['file'].close()
+                _lock_state['file'] = None
 
 
 def load_articles() -> Dict:
     """Load articles from JSON storage."""
-    
-    if not os.path.exists(STORAGE_PATH):
-        return {
-            "last_updated": datetime.utcnow().isoformat() + "Z",
-            "articles": []
-        }
-    
+    with timed('storage_load_duration_seconds'):
+        return _load_articles()
+
+
+def _empty_storage() -> Dict:
+    return {
+        "last_updated": datetime.utcnow().isoformat() + "Z",
+        "articles": []
+    }
+
+
+def _read_verified(path: str) -> Optional[Dict]:
+    """Parse a storage file, returning None if it is unreadable or fails its checksum."""
     try:
-        with open(STORAGE_PATH, 'r', encoding='utf-8') as f:
+        with open(path, 'r', encoding='utf-8') as f:
             data = json.load(f)
-            return data
-    except json.JSONDecodeError as e:
-        print(f"❌ JSON parse error: {e}")
-        # Try to restore from backup
-        if os.path.exists(BACKUP_PATH):
-            print("🔄 Restoring from backup...")
-            shutil.copy(BACKUP_PATH, STORAGE_PATH)
-            with open(STORAGE_PATH, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        else:
-            print("⚠️  No backup available, returning empty structure")
-            return {
-                "last_updated": datetime.utcnow().isoformat() + "Z",
-                "articles": []
-            }
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"❌ Could not read {os.path.basename(path)}: {e}")
+        return None
+    
+    if not isinstance(data, dict) or not isinstance(data.get('articles'), list):
+        print(f"❌ Invalid structure in {os.path.basename(path)}")
+        return None
+    
+    # Files written before content hashes existed are accepted as-is
+    stored_hash = data.get('content_hash')
+    if stored_hash is not None and stored_hash != compute_content_hash(data['articles']):
+        print(f"❌ Checksum mismatch in {os.path.basename(path)}")
+        return None
+    
+    data['articles'], errors = from_dicts(data['articles'])
+    if errors:
+        print(f"⚠️  Skipped {len(errors)} invalid stored article(s): {errors[0]}")
+    return data
+
+
+def read_intact() -> Optional[Dict]:
+    """The storage file itself, or None if it is unreadable or fails its checksum (no recovery)."""
+    return _read_verified(STORAGE_PATH)
+
+
+def _load_articles() -> Dict:
+    paths = snapshots.candidates(STORAGE_PATH)
+    if not any(os.path.exists(path) for path in paths):
+        return _empty_storage()
+    
+    # Newest valid generation wins
+    for generation, path in enumerate(paths):
+        data = _read_verified(path)
+        if data is None:
+            continue
+        if generation > 0:
+            print(f"🔄 Restoring from generation {generation}...")
+            with storage_lock():
+                snapshots.restore(STORAGE_PATH, generation)
+        return data
+    
+    print("⚠️  No valid generation available, returning empty structure")
+    return _empty_storage()
 
 
-def save_articles(articles: List[Dict]) -> bool:
+def migrate_saved_flags() -> int:
+    """
+    Move `saved` flags of a pre-saved_store file to the default user and
+    rewrite the corpus without them. Returns the number of flags moved
+    (0, and no write, once the file is migrated).
+    """
+    with storage_lock():
+        data = _load_articles()
+        flagged = [article for article in data['articles'] if article.saved is not None]
+        if not flagged:
+            return 0
+        
+        ids = [article.id for article in flagged if article.saved]
+        print(f"🔄 Moving {len(ids)} saved flag(s) to the saved store ({saved_store.DEFAULT_USER})")
+        if ids:
+            saved_store.update_saved(saved_store.DEFAULT_USER, add=ids)
+        for article in flagged:
+            article.saved = None
+        
+        if _write_articles(data['articles'], read_header()) is None:
+            raise OSError("Could not rewrite articles.json without saved flags")
+        return len(ids)
+
+
+def is_current(data: Dict, header: Dict) -> bool:
+    """Whether loaded storage data still matches the header on disk."""
+    return (data.get('version', 0) == header.get('version', 0)
+            and data.get('content_hash') == header.get('content_hash'))
+
+
+def save_articles(articles: List[Article]) -> bool:
     """Save articles to JSON storage with atomic write."""
-    # Validate all articles
-    for article in articles:
-        if not validate_article(article):
-            print(f"❌ Invalid article: {article.get('title', 'Unknown')}")
-            return False
-    
-    # Create backup of existing file
-    # We do this only if the file exists and is valid (not empty)
-    if os.path.exists(STORAGE_PATH) and os.path.getsize(STORAGE_PATH) > 0:
-        try:
-            shutil.copy(STORAGE_PATH, BACKUP_PATH)
-        except Exception as e:
-            print(f"⚠️  Could not create backup: {e}")
+    return commit_articles(articles) is not None
+
+
+def commit_articles(articles: List[Article]) -> Optional[Dict]:
+    """
+    Replace the stored corpus with `articles` under the storage lock.
+    Writers that must not lose concurrent updates use commit_merged.
+    Returns the stored header (version, content_hash, last_updated) or None.
+    """
+    with timed('storage_save_duration_seconds'), storage_lock():
+        return _write_articles(articles, read_header())
+
+
+def commit_merged(new: List[Article]) -> Optional[Dict]:
+    """
+    Merge `new` with the articles stored right now (keeping saved ones) and
+    write the result, reading and writing under one lock so nothing another
+    writer committed in between is lost.
+    Returns the stored header plus the article count ('total'), or None.
+    """
+    with timed('storage_save_duration_seconds'), storage_lock():
+        merged = merge_articles(_load_articles()['articles'], new)
+        stored = _write_articles(merged, read_header())
+    if stored is None:
+        return None
+    return dict(stored, total=len(merged))
+
+
+def _write_articles(articles: List[Article], header: Dict) -> Optional[Dict]:
+    """Write articles under the storage lock. header is the currently stored one."""
+    # Validate all articles in one pass (schema dicts are accepted too)
+    articles, errors = from_dicts(articles)
+    if errors:
+        for error in errors:
+            print(f"❌ Invalid article {error}")
+        return None
+    
+    encoded = to_dicts(canonical_order(articles))
+    content_hash = compute_content_hash(encoded)
+    
+    # Unchanged content: no write, no backup, no new timestamp
+    if content_hash == header.get('content_hash'):
+        print(f"✅ No changes to {len(articles)} articles, skipping write")
+        return {
+            "content_hash": content_hash,
+            "last_updated": header.get('last_updated'),
+            "version": header.get('version', 0)
+        }
     
     # Prepare data structure
     data = {
+        "articles": encoded,
+        "content_hash": content_hash,
         "last_updated": datetime.utcnow().isoformat() + "Z",
-        "articles": articles
+        "version": header.get('version', 0) + 1
     }
     
-    # Write to temporary file first
-    temp_path = STORAGE_PATH + '.tmp'
+    def write(f):
+        json.dump(data, f, indent=2, sort_keys=True, ensure_ascii=False)
+        f.write('\n')
+    
+    # Temp file + fsync, previous file kept as generation 1, atomic rename
     try:
-        with open(temp_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        
-        # Atomic rename
-        shutil.move(temp_path, STORAGE_PATH)
+        snapshots.write_durably(STORAGE_PATH, write)
         print(f"✅ Saved {len(articles)} articles")
-        return True
+        return {key: value for key, value in data.items() if key != 'articles'}
         
     except Exception as e:
         print(f"❌ Save error: {e}")
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
-        return False
+        return None
 
 
-def update_saved_status(article_id: str, saved: bool) -> bool:
-    """Update the saved status of a specific article."""
-    data = load_articles()
-    
-    for article in data['articles']:
-        if article['id'] == article_id:
-            article['saved'] = saved
-            return save_articles(data['articles'])
+def update_saved_status(article_id: str, saved: bool, cached: Dict = None,
+                        user: str = saved_store.DEFAULT_USER) -> Optional[int]:
+    """
+    Update the saved status of a specific article for a user.
+    Only the user's saved set is written; articles.json is not touched.
+    `cached` is a previously loaded storage dict, used to check that the
+    article exists. Returns the user's saved version, or None if not found.
+    """
+    data = cached if cached is not None else load_articles()
+    if not any(article.id == article_id for article in data['articles']):
+        print(f"⚠️  Article not found: {article_id}")
+        return None
     
-    print(f"⚠️  Article not found: {article_id}")
-    return False
+    return saved_store.set_saved(article_id, saved, user)
 
 
-def merge_articles(existing: List[Dict], new: List[Dict]) -> List[Dict]:
+def merge_articles(existing: List[Article], new: List[Article], saved_ids: frozenset = None) -> List[Article]:
     """
     Merge new articles with existing ones.
-    Preserves 'saved' status from existing articles.
+    Existing articles saved by any user (saved_ids, defaulting to the saved
+    store) are kept even if they are not in the new batch.
     """
-    # Create lookup by ID
-    existing_map = {article['id']: article for article in existing}
+    if saved_ids is None:
+        saved_ids = saved_store.all_saved_ids()
     
     merged = []
     seen_ids = set()
     
-    # Add new articles (preserving saved status if they exist)
+    # Add new articles
     for article in new:
-        article_id = article['id']
-        if article_id in existing_map:
-            # Preserve saved status
-            article['saved'] = existing_map[article_id]['saved']
-        
-        if article_id not in seen_ids:
+        if article.id not in seen_ids:
             merged.append(article)
-            seen_ids.add(article_id)
+            seen_ids.add(article.id)
     
     # Add existing saved articles that aren't in new batch
     for article in existing:
-        if article['saved'] and article['id'] not in seen_ids:
+        if article.id in saved_ids and article.id not in seen_ids:
             merged.append(article)
-            seen_ids.add(article['id'])
+            seen_ids.add(article.id)
     
     return merged
 
@@ -155,17 +344,16 @@ if __name__ == "__main__":
     print(f"Loaded {len(data['articles'])} articles")
     
     # Test save
-    test_article = {
-        "id": generate_article_id("https://test.com/article"),
-        "title": "Test Article",
-        "source": "Test Source",
-        "url": "https://test.com/article",
-        "summary": "This is a test",
-        "published_at": datetime.utcnow().isoformat() + "Z",
-        "category": "Test",
-        "saved": False,
-        "metadata": {}
-    }
+    test_article = Article(
+        id=generate_article_id("https://test.com/article"),
+        title="Test Article",
+        source="Test Source",
+        url="https://test.com/article",
+        summary="This is a test",
+        published_at=datetime.utcnow().isoformat() + "Z",
+        category="Test",
+        metadata={}
+    )
     
     save_articles([test_article])
     print("✅ Storage manager test complete")
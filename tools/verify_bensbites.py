@@ -2,36 +2,20 @@
 """
 Handshake Tool: Verify Ben's Bites Archive Accessibility
 Tests if we can fetch and parse the archive page.
+Runs the bensbites probes of probe.py (see there for timings and SLOs).
 """
 
-import requests
-from bs4 import BeautifulSoup
+import os
 import sys
 
+sys.path.insert(0, os.path.dirname(__file__))
+from probe import run_probes, print_report
+
 def verify_bensbites():
     """Verify Ben's Bites archive is accessible."""
-    url = "https://bensbites.com/archive"
-    
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'lxml')
-        
-        # Look for article links (they use /p/ pattern)
-        article_links = soup.find_all('a', href=lambda x: x and '/p/' in x)
-        
-        if article_links:
-            print(f"✅ SUCCESS: Found {len(article_links)} article links")
-            print(f"Sample: {article_links[0].get('href')}")
-            return True
-        else:
-            print("⚠️  WARNING: No article links found")
-            return False
-            
-    except requests.RequestException as e:
-        print(f"❌ ERROR: {e}")
-        return False
+    report = run_probes(['bensbites'])
+    print_report(report)
+    return report['ok']
 
 if __name__ == "__main__":
     success = verify_bensbites()
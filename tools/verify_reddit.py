@@ -1,37 +1,21 @@
 #!/usr/bin/env python3
 """
 Handshake Tool: Verify Reddit JSON Endpoint Accessibility
-Tests if we can fetch top posts from AI subreddits.
+Tests if we can fetch top posts from AI subreddits (all checked, concurrently).
+Runs the reddit probes of probe.py (see there for timings and SLOs).
 """
 
-import requests
+import os
 import sys
 
+sys.path.insert(0, os.path.dirname(__file__))
+from probe import run_probes, print_report
+
 def verify_reddit():
-    """Verify Reddit JSON endpoint is accessible."""
-    subreddits = ['artificial', 'MachineLearning', 'Singularity']
-    
-    for subreddit in subreddits:
-        url = f"https://reddit.com/r/{subreddit}/top.json?t=day&limit=5"
-        
-        try:
-            headers = {'User-Agent': 'AI-News-Dashboard/1.0'}
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            posts = data.get('data', {}).get('children', [])
-            
-            if posts:
-                print(f"✅ SUCCESS: r/{subreddit} - Found {len(posts)} posts")
-            else:
-                print(f"⚠️  WARNING: r/{subreddit} - No posts found")
-                
-        except requests.RequestException as e:
-            print(f"❌ ERROR: r/{subreddit} - {e}")
-            return False
-    
-    return True
+    """Verify Reddit JSON endpoints are accessible."""
+    report = run_probes(['reddit'])
+    print_report(report)
+    return report['ok']
 
 if __name__ == "__main__":
     success = verify_reddit()
@@ -2,37 +2,20 @@
 """
 Handshake Tool: Verify The AI Rundown Archive Accessibility
 Tests if we can fetch and parse the archive page.
+Runs the rundown probes of probe.py (see there for timings and SLOs).
 """
 
-import requests
-from bs4 import BeautifulSoup
+import os
 import sys
 
+sys.path.insert(0, os.path.dirname(__file__))
+from probe import run_probes, print_report
+
 def verify_rundown():
     """Verify The AI Rundown archive is accessible."""
-    url = "https://therundown.ai/archive"
-    
-    try:
-        headers = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'}
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'lxml')
-        
-        # Look for article links (they use /p/ pattern)
-        article_links = soup.find_all('a', href=lambda x: x and '/p/' in x)
-        
-        if article_links:
-            print(f"✅ SUCCESS: Found {len(article_links)} article links")
-            print(f"Sample: {article_links[0].get('href')}")
-            return True
-        else:
-            print("⚠️  WARNING: No article links found")
-            return False
-            
-    except requests.RequestException as e:
-        print(f"❌ ERROR: {e}")
-        return False
+    report = run_probes(['rundown'])
+    print_report(report)
+    return report['ok']
 
 if __name__ == "__main__":
     success = verify_rundown()